@@ -0,0 +1,214 @@
+"""
+Pre-render every static assistant phrase with Kokoro.
+
+Scans the code base for `speak(...)` calls whose text is known ahead of
+time: string literals, variables only ever assigned literals, and f-string
+templates whose placeholders have a known set of values (e.g. `app_name`
+from apps.json). Every phrase is synthesized in parallel across CPU cores
+and written to audio_responses/prerendered together with a manifest that
+core/tts.py loads at startup, so fixed phrases never reach the live
+synthesizer.
+
+Usage (from the project root):
+    python assets/tts/prerender_phrases.py [--workers N] [--dry-run]
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.tts_cache import TTSCache, MODEL_VERSION, normalize_text
+
+PRERENDER_DIR = os.path.join("audio_responses", "prerendered")
+MANIFEST_NAME = "manifest.json"
+SCAN_PATHS = ["main.py", "web_app.py", "core", "skills"]
+DEFAULT_VOICE = "af_heart"
+DEFAULT_SPEED = 1.0
+
+
+def _app_names():
+    with open(os.path.join(PROJECT_ROOT, "assets", "apps", "apps.json"), "r") as f:
+        return sorted(json.load(f).keys())
+
+
+# Known values for f-string placeholders in spoken templates
+TEMPLATE_VALUES = {
+    "app_name": _app_names,
+}
+
+
+def _python_files(paths):
+    for path in paths:
+        full = os.path.join(PROJECT_ROOT, path)
+        if os.path.isfile(full):
+            yield full
+        for root, _, files in os.walk(full):
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    yield os.path.join(root, name)
+
+
+def _literal_assignments(scope):
+    """Map variable name -> list of string literals assigned to it in a scope."""
+    # A variable that is only sometimes dynamic still contributes its literals
+    values = {}
+    for node in ast.walk(scope):
+        if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant)
+                and isinstance(node.value.value, str)):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                values.setdefault(target.id, []).append(node.value.value)
+    return values
+
+
+def _expand(node, assignments):
+    """Return the list of phrases an argument expression can take, or []."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, ast.IfExp):
+        return _expand(node.body, assignments) + _expand(node.orelse, assignments)
+    if isinstance(node, ast.Name):
+        return list(assignments.get(node.id, []))
+    if isinstance(node, ast.JoinedStr):
+        phrases = [""]
+        for part in node.values:
+            if isinstance(part, ast.Constant):
+                phrases = [p + str(part.value) for p in phrases]
+            elif (isinstance(part, ast.FormattedValue) and isinstance(part.value, ast.Name)
+                  and part.value.id in TEMPLATE_VALUES and part.format_spec is None):
+                values = TEMPLATE_VALUES[part.value.id]()
+                phrases = [p + v for p in phrases for v in values]
+            else:
+                return []
+        return phrases
+    return []
+
+
+def _keyword(call, name, default):
+    for kw in call.keywords:
+        if kw.arg == name and isinstance(kw.value, ast.Constant):
+            return kw.value.value
+    return default
+
+
+def find_phrases(paths=SCAN_PATHS):
+    """
+    Statically collect (text, voice, speed, source) for every speak() call
+    whose text can be determined without running the code.
+    """
+    phrases = {}
+    for path in _python_files(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        rel_path = os.path.relpath(path, PROJECT_ROOT)
+
+        scopes = [tree] + [n for n in ast.walk(tree)
+                           if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        for scope in scopes:
+            assignments = _literal_assignments(scope)
+            for node in ast.walk(scope):
+                if not (isinstance(node, ast.Call) and node.args):
+                    continue
+                func = node.func
+                name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+                if name != "speak":
+                    continue
+                voice = _keyword(node, "voice", DEFAULT_VOICE)
+                speed = float(_keyword(node, "speed", DEFAULT_SPEED))
+                for text in _expand(node.args[0], assignments):
+                    key = (normalize_text(text), voice, speed)
+                    phrases.setdefault(key, (text, voice, speed, f"{rel_path}:{node.lineno}"))
+    return list(phrases.values())
+
+
+# --- Worker processes: one Kokoro pipeline each ---
+_pipeline = None
+
+def _init_worker(lang_code):
+    global _pipeline
+    import torch
+    from kokoro import KPipeline
+
+    # One core per worker; parallelism comes from the process pool
+    torch.set_num_threads(1)
+    _pipeline = KPipeline(lang_code=lang_code)
+
+def _synthesize(job):
+    import numpy as np
+
+    text, voice, speed = job
+    parts = []
+    for _, _, audio in _pipeline(text, voice=voice, speed=speed):
+        if audio is not None:
+            parts.append(audio.detach().cpu().numpy() if hasattr(audio, "detach") else np.asarray(audio))
+    # The pipeline yields no audio for text without speakable content
+    return job, np.concatenate(parts).astype(np.float32) if parts else None
+
+
+def prerender(output_dir=PRERENDER_DIR, workers=None, dry_run=False, lang_code="a"):
+    phrases = find_phrases()
+    print(f"🔍 Found {len(phrases)} static phrases.")
+    if dry_run:
+        for text, voice, speed, source in phrases:
+            print(f"  {source}: {text!r}")
+        return
+
+    # No size cap: pre-rendered phrases must never be evicted
+    store = TTSCache(directory=output_dir, max_bytes=float("inf"))
+    manifest = []
+    jobs = []
+    for text, voice, speed, source in phrases:
+        key = store.key(text, voice, speed)
+        manifest.append({"text": text, "voice": voice, "speed": speed, "key": key, "source": source})
+        if key not in store:
+            jobs.append((text, voice, speed))
+
+    workers = workers or os.cpu_count() or 1
+    print(f"🔄 Rendering {len(jobs)} new phrases on {workers} workers "
+          f"({len(phrases) - len(jobs)} already up to date)...")
+    start = time.time()
+    skipped = set()
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(lang_code,)) as pool:
+            futures = [pool.submit(_synthesize, job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                (text, voice, speed), audio = future.result()
+                if audio is None:
+                    print(f"⚠️ [{done}/{len(jobs)}] No audio for {text!r}, skipping it")
+                    skipped.add(store.key(text, voice, speed))
+                    continue
+                store.put(text, voice, speed, audio)
+                print(f"  [{done}/{len(jobs)}] {text}")
+        manifest = [entry for entry in manifest if entry["key"] not in skipped]
+
+    # Drop renders that no longer correspond to a phrase in the code
+    keep = {entry["key"] for entry in manifest}
+    for name in os.listdir(output_dir):
+        if name.endswith(".flac") and name[:-5] not in keep:
+            os.remove(os.path.join(output_dir, name))
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({"model_version": MODEL_VERSION, "samplerate": store.samplerate,
+                   "phrases": manifest}, f, indent=2)
+    print(f"✅ Pre-rendered {len(manifest)} phrases in {time.time() - start:.2f} seconds.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default=PRERENDER_DIR, help="output directory")
+    parser.add_argument("--dry-run", action="store_true", help="only list the phrases found")
+    args = parser.parse_args()
+
+    os.chdir(PROJECT_ROOT)
+    prerender(output_dir=args.output, workers=args.workers, dry_run=args.dry_run)
@@ -0,0 +1,439 @@
+# core/async_openrouter_client.py
+
+"""
+asyncio-native OpenRouter client.
+
+Requests run on one background event loop, so the synchronous voice loop
+can start a reply, consume it as a plain iterator and cancel it at any time
+(barge-in, exit phrase) without waiting for a timeout. Tail latency is cut
+with hedged requests: if the primary model has not produced its first token
+after its observed p95 latency, the same request is sent to a backup model
+and whichever answers first wins. A primary that fails outright fails over
+to the backup at once. With a ModelRouter (core/model_router.py) the
+primary/backup pair is chosen per request.
+"""
+
+import asyncio
+import collections
+import json
+import os
+import queue
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from core.llm_providers import LLMProvider, ReplyStream
+from core.resilience import (Deadline, DeadlineExceeded, ServiceUnavailable, backoff_delay,
+                             current_deadline, get_breaker, get_retry_budget)
+
+API_URL = "https://openrouter.ai/api/v1/chat/completions"
+DEFAULT_MODEL = "openrouter/sonoma-dusk-alpha"
+BACKUP_MODEL = os.getenv("OPENROUTER_BACKUP_MODEL")
+# Hedge delay used until enough latencies have been seen to estimate the p95
+HEDGE_DELAY = float(os.getenv("OPENROUTER_HEDGE_DELAY", "2.0"))
+# Longest wait for the first token of a reply, across all retries and models
+FIRST_TOKEN_DEADLINE = float(os.getenv("OPENROUTER_FIRST_TOKEN_DEADLINE", "12"))
+# How long an idle pooled connection is kept (httpx closes them after 5s by default)
+KEEPALIVE_EXPIRY = 60.0
+
+# Failures the voice loop reports to the user instead of retrying
+REQUEST_ERRORS = (httpx.HTTPError, ServiceUnavailable, DeadlineExceeded, KeyError, IndexError, ValueError)
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class LatencyRecord:
+    """Recent time-to-first-token samples per model, shared by the client and a ModelRouter."""
+
+    def __init__(self, window=50):
+        self.window = window
+        self._samples: Dict[str, collections.deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(model, collections.deque(maxlen=self.window)).append(seconds)
+
+    def count(self, model: str) -> int:
+        with self._lock:
+            return len(self._samples.get(model, ()))
+
+    def p95(self, model: str, min_samples=10) -> Optional[float]:
+        """The model's p95, or None until there are enough samples to trust."""
+        with self._lock:
+            samples = list(self._samples.get(model, ()))
+        return percentile(samples, 95) if len(samples) >= min_samples else None
+
+
+class _EventLoopThread:
+    """A single asyncio loop running on a daemon thread."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> _EventLoopThread:
+    global _loop_thread
+    with _loop_lock:
+        if _loop_thread is None:
+            _loop_thread = _EventLoopThread()
+        return _loop_thread
+
+
+class _HandshakeTimer:
+    """
+    httpcore trace hook adding up the TCP connect and TLS handshake time of
+    one request; stays 0 when a pooled connection was reused.
+    """
+
+    _STEPS = ("connect_tcp", "start_tls")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._started = None
+
+    async def __call__(self, event: str, info: dict):
+        step, _, phase = event.rpartition(".")
+        if not step.endswith(self._STEPS):
+            return
+        if phase == "started":
+            self._started = time.time()
+        elif phase in ("complete", "failed") and self._started is not None:
+            self.seconds += time.time() - self._started
+            self._started = None
+
+
+class _Stream:
+    """An open streaming response whose first token has already arrived."""
+
+    def __init__(self, model, response, deltas, first, timing):
+        self.model = model
+        self.response = response
+        self.deltas = deltas
+        self.first = first
+        self.timing = timing
+
+    async def aclose(self):
+        await self.deltas.aclose()
+        await self.response.aclose()
+
+
+class AsyncOpenRouterClient(LLMProvider):
+    name = "openrouter"
+
+    def __init__(self, api_key=None, model=DEFAULT_MODEL, backup_model=BACKUP_MODEL,
+                 hedge_delay=HEDGE_DELAY, connect_timeout=5.0, read_timeout=30.0, max_retries=3,
+                 pool_size=int(os.getenv("OPENROUTER_POOL_SIZE", "4")), latency_window=50, router=None):
+        super().__init__()
+        self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
+        if not self.api_key:
+            raise ValueError("OpenRouter API key is required")
+        self.model = model
+        self.backup_model = backup_model
+        # Optional core.model_router.ModelRouter choosing (primary, backup) per request
+        self.router = router
+        # The router ranks models by the same samples the hedge delay comes from
+        self.latencies = router.latencies if router is not None else LatencyRecord(latency_window)
+        self.hedge_delay = hedge_delay
+        self.api_url = API_URL
+        self.max_retries = max_retries
+        # A dead connection fails in seconds; only the wait for tokens gets the long timeout
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                                   keepalive_expiry=KEEPALIVE_EXPIRY)
+        self._http = None
+        self._inflight = set()
+        self._inflight_lock = threading.Lock()
+
+    def _client(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to the loop it is used on
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    # --- Latency tracking ---
+
+    def _record_latency(self, model: str, seconds: float):
+        self.latencies.record(model, seconds)
+        if self.router is not None:
+            self.router.record_success(model)
+
+    def _record_failure(self, model: str):
+        if self.router is not None:
+            self.router.record_failure(model)
+
+    def hedge_after(self, model: Optional[str] = None) -> float:
+        """Seconds to wait for a first token before hedging: the observed p95."""
+        p95 = self.latencies.p95(model or self.model)
+        return self.hedge_delay if p95 is None else p95
+
+    # --- Requests ---
+
+    async def prewarm(self):
+        """
+        Open (or refresh) a pooled connection before a conversational turn.
+
+        Called at startup and again on every wake word, since the server may
+        have dropped an idle connection since the last conversation.
+        """
+        try:
+            handshake = _HandshakeTimer()
+            await self._client().head(self.api_url, extensions={"trace": handshake})
+            print(f"🔌 OpenRouter connection ready (handshake {handshake.seconds:.2f}s).")
+        except httpx.HTTPError as e:
+            print(f"⚠️ Could not prewarm OpenRouter connection: {e}")
+
+    async def _deltas(self, response) -> AsyncIterator[str]:
+        async for line in response.aiter_lines():
+            # Blank keep-alives and ": OPENROUTER PROCESSING" comments
+            if not line or not line.startswith("data:"):
+                continue
+            payload = line[len("data:"):].strip()
+            if payload == "[DONE]":
+                return
+            delta = json.loads(payload)["choices"][0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+
+    async def _open(self, model: str, messages: List[Dict], deadline: Deadline) -> _Stream:
+        """Send one request and wait for its first token."""
+        start = time.time()
+        client = self._client()
+        # Never wait on a socket longer than the reply has left
+        remaining = deadline.timeout(self.timeout.read)
+        handshake = _HandshakeTimer()
+        timeout = httpx.Timeout(remaining, connect=min(self.timeout.connect, remaining))
+        request = client.build_request("POST", self.api_url, json={
+            "model": model,
+            "messages": messages,
+            "stream": True,
+        }, extensions={"timeout": timeout.as_dict(), "trace": handshake})
+        response = await client.send(request, stream=True)
+        deltas = self._deltas(response)
+        try:
+            response.raise_for_status()
+            try:
+                first = await deltas.__anext__()
+            except StopAsyncIteration:
+                first = ""
+        except BaseException:
+            await deltas.aclose()
+            await response.aclose()
+            raise
+        elapsed = time.time() - start
+        self._record_latency(model, elapsed)
+        # Connection setup and model time are reported apart: a slow first
+        # token on a fresh connection is not the model's fault
+        timing = {"model": model, "first_token": elapsed, "connect": handshake.seconds,
+                  "server": elapsed - handshake.seconds, "reused_connection": handshake.seconds == 0.0}
+        return _Stream(model, response, deltas, first, timing)
+
+    async def _open_with_retries(self, model: str, messages: List[Dict], deadline: Deadline,
+                                 attempts=None) -> _Stream:
+        """
+        Retry a model until it starts answering. Each model has its own circuit
+        breaker, so during an outage this fails at once instead of timing out;
+        retries back off with jitter and draw from a shared retry budget.
+        """
+        attempts = attempts or self.max_retries
+        breaker = get_breaker(f"openrouter:{model}")
+        budget = get_retry_budget("openrouter")
+        budget.record_call()
+        for attempt in range(attempts):
+            breaker.allow()
+            try:
+                stream = await self._open(model, messages, deadline)
+            except httpx.TimeoutException:
+                print(f"⏱️ Request timeout on {model} (attempt {attempt + 1}/{attempts})")
+            except httpx.TransportError:
+                print(f"🌐 Connection error on {model} (attempt {attempt + 1}/{attempts})")
+            except httpx.HTTPStatusError as e:
+                print(f"🚨 HTTP error on {model}: {e.response.status_code} (attempt {attempt + 1}/{attempts})")
+                if e.response.status_code < 500 and e.response.status_code != 429:
+                    # The request itself is wrong; the endpoint is fine
+                    breaker.release()
+                    self._record_failure(model)
+                    raise
+            except BaseException:
+                # Lost a hedge race, user moved on, out of time or an unreadable
+                # reply: says nothing about the endpoint, but must free a
+                # half-open trial slot
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return stream
+            breaker.record_failure()
+            self._record_failure(model)
+            delay = backoff_delay(attempt)
+            if attempt == attempts - 1 or deadline.remaining() <= delay or not budget.try_spend():
+                break
+            await asyncio.sleep(delay)
+        raise ServiceUnavailable(f"{model} did not respond")
+
+    def _pick_models(self, messages: List[Dict]):
+        if self.router is not None:
+            return self.router.choose(messages)
+        return self.model, self.backup_model if self.backup_model != self.model else None
+
+    async def _open_hedged(self, messages: List[Dict], deadline: Deadline) -> _Stream:
+        """
+        Start the primary model. The backup joins if the primary is slower
+        than its p95 (hedge) or fails outright (failover).
+        """
+        primary, backup = self._pick_models(messages)
+        # With somewhere to fail over to, switching beats retrying a degraded model
+        tasks = [asyncio.ensure_future(
+            self._open_with_retries(primary, messages, deadline, attempts=1 if backup else None))]
+
+        def _start_backup(reason):
+            print(f"[DEBUG] {reason}, trying {backup}")
+            tasks.append(asyncio.ensure_future(self._open_with_retries(backup, messages, deadline)))
+
+        try:
+            if backup:
+                delay = self.hedge_after(primary)
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    _start_backup(f"No first token from {primary} after {delay:.2f}s")
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [t for t in done if not t.cancelled() and t.exception() is None]
+                errors = [t.exception() for t in done if not t.cancelled() and t.exception() is not None]
+                error = error or (errors[0] if errors else None)
+                if winners:
+                    # Two streams finishing in the same tick: keep one, close the other
+                    for loser in winners[1:]:
+                        await loser.result().aclose()
+                    return winners[0].result()
+                if errors and backup and len(tasks) == 1:
+                    _start_backup(f"{primary} failed")
+                    pending.add(tasks[-1])
+            raise error or ServiceUnavailable("No model responded")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _first_token_deadline(self) -> Deadline:
+        """The turn's deadline (core.resilience.deadline), capped at FIRST_TOKEN_DEADLINE."""
+        limit = Deadline(FIRST_TOKEN_DEADLINE)
+        turn = current_deadline()
+        return turn if turn is not None and turn.expires_at < limit.expires_at else limit
+
+    async def stream_response(self, messages: List[Dict], deadline: Deadline = None,
+                              timing: Optional[Dict] = None) -> AsyncIterator[str]:
+        """
+        Yield text deltas of the reply; raises if no model could answer in
+        time. `timing`, if given, receives this reply's model and latencies.
+        """
+        timing = {} if timing is None else timing
+        start = time.time()
+        deadline = deadline or self._first_token_deadline()
+        try:
+            stream = await asyncio.wait_for(self._open_hedged(messages, deadline), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"no reply within {time.time() - start:.1f}s") from None
+        timing.update(stream.timing)
+        print(f"[DEBUG] OpenRouter: first token from {stream.model} after {timing['first_token']:.2f}s "
+              f"(handshake {timing['connect']:.2f}s"
+              f"{', reused connection' if timing['reused_connection'] else ''}, model {timing['server']:.2f}s)")
+        try:
+            if stream.first:
+                yield stream.first
+            async for delta in stream.deltas:
+                yield delta
+            timing["total"] = time.time() - start
+        finally:
+            await stream.aclose()
+
+    async def get_response(self, messages: List[Dict]) -> Optional[str]:
+        """Complete reply as one string, or None on failure."""
+        try:
+            return "".join([delta async for delta in self.stream_response(messages)])
+        except REQUEST_ERRORS as e:
+            print(f"❌ OpenRouter request failed: {e}")
+            return None
+
+    # --- Synchronous bridge for the voice loop ---
+
+    def start_prewarm(self, system_prompt: Optional[str] = None):
+        _background_loop().submit(self.prewarm())
+
+    def stream_sync(self, messages: List[Dict]) -> ReplyStream:
+        """
+        Start stream_response on the background loop and return an iterator
+        over its deltas.
+
+        The request is sent (and the caller's deadline captured) right away,
+        not on the first next(). The iterator ends early, without error, if
+        the request fails or is cancelled (ReplyStream.cancel() for this
+        reply, cancel() for all); see the stream's `error`.
+        """
+        deltas = queue.Queue()
+        deadline = self._first_token_deadline()
+        reply = None
+
+        async def _pump():
+            try:
+                async for delta in self.stream_response(messages, deadline, reply.timing):
+                    deltas.put(delta)
+            except asyncio.CancelledError:
+                print("[DEBUG] OpenRouter request cancelled")
+            except REQUEST_ERRORS as e:
+                print(f"❌ OpenRouter request failed: {e}")
+                reply.error = e
+            finally:
+                deltas.put(None)
+
+        def _release():
+            future.cancel()
+            with self._inflight_lock:
+                self._inflight.discard(future)
+
+        reply = ReplyStream(deltas, _release)
+        future = _background_loop().submit(_pump())
+        with self._inflight_lock:
+            self._inflight.add(future)
+        return reply
+
+    def get_response_sync(self, messages: List[Dict]) -> Optional[str]:
+        return "".join(self.stream_sync(messages)) or None
+
+    def cancel(self):
+        """Cancel every in-flight request (safe to call from any thread)."""
+        with self._inflight_lock:
+            futures = list(self._inflight)
+        for future in futures:
+            future.cancel()
+        return len(futures)
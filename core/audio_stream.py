@@ -0,0 +1,263 @@
+# core/audio_stream.py
+
+import collections
+import threading
+from typing import Optional
+
+import numpy as np
+import speech_recognition as sr
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2        # int16
+FRAME_MS = 30
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+BUFFER_SECONDS = 30
+
+
+class MicrophoneStream:
+    """
+    Single long-lived microphone capture feeding a shared ring buffer.
+
+    The device is opened once and never reopened between phrases. Every
+    consumer (wake word detector, command listener) reads through its own
+    StreamReader cursor, so nothing spoken between two phrases is dropped.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS,
+                 buffer_seconds=BUFFER_SECONDS, device=None):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.device = device
+        self._frames = collections.deque(maxlen=int(buffer_seconds * 1000 / frame_ms))
+        self._next_index = 0  # absolute index of the next frame to be captured
+        self._cond = threading.Condition()
+        self._stream = None
+
+    def start(self):
+        """Open the input device. Safe to call more than once."""
+        if self._stream is not None:
+            return
+        # Imported here so modules using only the buffers work without PortAudio
+        import sounddevice as sd
+
+        self._stream = sd.RawInputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.frame_samples,
+            channels=1,
+            dtype='int16',
+            device=self.device,
+            callback=self._on_audio,
+        )
+        self._stream.start()
+        print("🎙️ Microphone stream opened.")
+
+    def stop(self):
+        if self._stream is None:
+            return
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+
+    @property
+    def is_active(self) -> bool:
+        return self._stream is not None
+
+    def _on_audio(self, indata, frames, time_info, status):
+        with self._cond:
+            self._frames.append(bytes(indata))
+            self._next_index += 1
+            self._cond.notify_all()
+
+    @property
+    def latest_index(self) -> int:
+        """Absolute index of the next frame that will be captured."""
+        with self._cond:
+            return self._next_index
+
+    def read_frame(self, index: int, timeout: Optional[float] = None):
+        """
+        Return (frame_bytes, next_index) for the frame at an absolute index.
+
+        Blocks until the frame has been captured. A reader that fell further
+        behind than the buffer holds is moved forward to the oldest frame still
+        retained. Returns (None, index) if the timeout expires first.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: index < self._next_index, timeout):
+                return None, index
+            oldest = self._next_index - len(self._frames)
+            if index < oldest:
+                index = oldest
+            return self._frames[index - oldest], index + 1
+
+    def reader(self) -> "StreamReader":
+        """Create a cursor positioned at the live edge of the stream."""
+        self.start()
+        return StreamReader(self, self.latest_index)
+
+
+class StreamReader:
+    """Independent read cursor over a MicrophoneStream."""
+
+    def __init__(self, stream: MicrophoneStream, index: int):
+        self.stream = stream
+        self.index = index
+
+    def read(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Return the next frame, or None if none arrived within the timeout."""
+        frame, self.index = self.stream.read_frame(self.index, timeout)
+        return frame
+
+    def seek_latest(self):
+        """Skip everything buffered so far, e.g. after a long callback."""
+        self.index = self.stream.latest_index
+
+    def rewind(self, seconds: float):
+        """Step back to re-read recently captured audio (pre-roll)."""
+        self.index = max(0, self.index - int(seconds * 1000 / self.stream.frame_ms))
+
+
+class _ReaderAdapter:
+    """File-like wrapper that speech_recognition reads chunks from."""
+
+    def __init__(self, reader: StreamReader):
+        self.reader = reader
+
+    def read(self, size: int) -> bytes:
+        needed = size * SAMPLE_WIDTH
+        data = b""
+        while len(data) < needed:
+            data += self.reader.read()
+        return data
+
+
+class RingBufferSource(sr.AudioSource):
+    """
+    speech_recognition AudioSource backed by the shared microphone stream.
+
+    Entering and leaving the context manager is free: the device stays open,
+    so `with source:` can be used per phrase without any reopen latency.
+    """
+
+    def __init__(self, reader: StreamReader):
+        self.reader = reader
+        self.SAMPLE_RATE = reader.stream.sample_rate
+        self.SAMPLE_WIDTH = SAMPLE_WIDTH
+        self.CHUNK = reader.stream.frame_samples
+        self.stream = _ReaderAdapter(reader)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class NoiseFloorEstimator:
+    """
+    Tracks the background noise level of the stream in a daemon thread.
+
+    The noise floor is a low percentile of frame energy over the last few
+    seconds, so it follows slow changes in the room (a fan, traffic) while
+    short bursts of speech barely move it. Listeners read `energy_threshold`
+    instead of calibrating for a second before every utterance.
+    """
+
+    def __init__(self, stream: MicrophoneStream, window_s=5.0, percentile=10,
+                 ratio=2.0, min_threshold=50.0, calibration_s=1.0, update_s=0.3):
+        self.stream = stream
+        self.percentile = percentile
+        self.ratio = ratio
+        self.min_threshold = min_threshold
+        frame_s = stream.frame_ms / 1000.0
+        self._energies = collections.deque(maxlen=int(window_s / frame_s))
+        self._calibration_frames = int(calibration_s / frame_s)
+        self._update_frames = max(1, int(update_s / frame_s))
+        self._calibrated = threading.Event()
+        self._thread = None
+        self.noise_floor = 0.0
+        self.energy_threshold = 300.0  # speech_recognition's default until calibrated
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        reader = self.stream.reader()
+        since_update = 0
+        while True:
+            frame = reader.read(timeout=1.0)
+            if frame is None:
+                continue
+            samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+            self._energies.append(float(np.sqrt(np.mean(samples * samples))))
+
+            since_update += 1
+            if not self.is_calibrated:
+                if len(self._energies) >= self._calibration_frames:
+                    self._update()
+                    self._calibrated.set()
+            elif since_update >= self._update_frames:
+                self._update()
+                since_update = 0
+
+    def _update(self):
+        self.noise_floor = float(np.percentile(self._energies, self.percentile))
+        self.energy_threshold = max(self.min_threshold, self.noise_floor * self.ratio)
+
+    @property
+    def is_calibrated(self) -> bool:
+        return self._calibrated.is_set()
+
+    def wait_calibrated(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first calibration window has been measured."""
+        return self._calibrated.wait(timeout)
+
+    def stats(self) -> dict:
+        """Current values, for diagnostics."""
+        return {
+            "noise_floor": round(self.noise_floor, 1),
+            "energy_threshold": round(self.energy_threshold, 1),
+            "calibrated": self.is_calibrated,
+        }
+
+
+# Shared instances, opened on first use
+_microphone_stream = None
+_noise_floor = None
+_microphone_lock = threading.Lock()
+
+
+def get_microphone_stream() -> MicrophoneStream:
+    """Return the process-wide microphone stream, starting it if needed."""
+    global _microphone_stream
+    with _microphone_lock:
+        if _microphone_stream is None:
+            _microphone_stream = MicrophoneStream()
+        _microphone_stream.start()
+        return _microphone_stream
+
+
+def get_noise_floor() -> NoiseFloorEstimator:
+    """Return the noise floor tracker of the shared stream, starting it if needed."""
+    global _noise_floor
+    stream = get_microphone_stream()
+    with _microphone_lock:
+        if _noise_floor is None:
+            _noise_floor = NoiseFloorEstimator(stream)
+            _noise_floor.start()
+        return _noise_floor
+
+
+def current_energy_threshold() -> float:
+    """Energy threshold for the next utterance; waits for the first calibration only."""
+    noise_floor = get_noise_floor()
+    noise_floor.wait_calibrated(timeout=2.0)
+    return noise_floor.energy_threshold
+
+
+def open_source() -> RingBufferSource:
+    """Convenience helper: a speech_recognition source reading from now on."""
+    return RingBufferSource(get_microphone_stream().reader())
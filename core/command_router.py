@@ -1,23 +1,50 @@
 # core/command_router.py
 
 from core.tts import speak
-from skills.system.app_launcher import launch_notepad, launch_app, load_app_mappings
-from skills.general.hello_skill import say_hello
+from core.intent_matcher import IntentMatcher
+from skills.base_skill import Skill, SkillRegistry
+from skills.system.app_index import get_app_index
 import re
 
-# Import the browser skill runner (sync wrapper)
-from skills.browser_skill import run_browser_task_sync
+BROWSE_KEYWORDS = ["go to", "search", "look up"]
+GREETINGS = ["hello", "hi", "hey", "good morning", "good afternoon"]
+APP_VERBS = ["open", "launch", "start", "run"]
+
+# Skill modules are imported on first dispatch: the browser skill alone
+# pulls in browser_use and builds an LLM client
+SKILLS = SkillRegistry()
+SKILLS.register(Skill("browse", BROWSE_KEYWORDS, "skills.browser_skill:run_browser_task_sync", weight=3.0,
+                      description="Browse the web with an automated browser agent"))
+SKILLS.register(Skill("notepad", ["notepad"], "skills.system.app_launcher:launch_notepad", weight=3.0,
+                      description="Open Notepad"))
+SKILLS.register(Skill("open_app", APP_VERBS, "skills.system.app_launcher:launch_app", weight=2.0,
+                      description="Launch an application from assets/apps/apps.json"))
+SKILLS.register(Skill("greeting", GREETINGS, "skills.general.hello_skill:say_hello", weight=1.5,
+                      description="Greet the user"))
+
+# Weights break ties between intents; a trigger phrase that does not start
+# the command counts half, so "how do I start a business" stays with the LLM
+INTENTS = IntentMatcher()
+for _skill in SKILLS:
+    INTENTS.add(_skill.name, _skill.triggers, weight=_skill.weight)
+
+# Lowest score route_command acts on
+MIN_INTENT_SCORE = 1.5
+
 
 def route_command(command):
     """Route commands to appropriate handlers. Returns True if handled, False otherwise."""
     command_lower = command.lower().strip()
+    match = INTENTS.best(command_lower, MIN_INTENT_SCORE)
+    intent = match.intent if match else None
+    if match:
+        print(f"[DEBUG] Intent: {intent} ('{match.phrase}', score {match.score:.2f})")
 
     # --- Browser skill detection ---
-    browse_keywords = ["go to", "search", "look up"]
-    if any(keyword in command_lower for keyword in browse_keywords):
+    if intent == "browse":
         try:
             speak("Understood, Sir. I'll fetch the information now.")
-            success = run_browser_task_sync(command)
+            success = SKILLS.get("browse")(command)
             if not success:
                 speak("Sorry, Sir. I couldn't complete the browsing task.")
             else:
@@ -31,16 +58,16 @@ def route_command(command):
     # --- Existing routing logic ---
 
     # Handle hello/greeting commands
-    if any(word in command_lower for word in ["hello", "hi", "hey", "good morning", "good afternoon"]):
-        say_hello()
+    if intent == "greeting":
+        SKILLS.get("greeting")()
         return True
 
     # Handle app launching commands
-    elif any(phrase in command_lower for phrase in ["open", "launch", "start", "run"]):
+    elif intent == "open_app":
         app_name = extract_app_name(command_lower)
         if app_name:
             speak(f"Opening {app_name}, Sir.")
-            success = launch_app(app_name)
+            success = SKILLS.get("open_app")(app_name)
             if not success:
                 speak(f"I apologize, Sir. I couldn't open {app_name}.")
             return True
@@ -49,9 +76,9 @@ def route_command(command):
             return True
 
     # Handle specific notepad command for backward compatibility
-    elif "notepad" in command_lower:
+    elif intent == "notepad":
         speak("Opening Notepad, Sir.")
-        launch_notepad()
+        SKILLS.get("notepad")()
         return True
 
     # Handle empty commands
@@ -63,24 +90,34 @@ def route_command(command):
     return False
 
 
+def match_early_command(partial_text):
+    """
+    Return a command that is safe to dispatch while the user is still speaking.
+    
+    Only app launches that name a known app exactly ("open firefox") qualify;
+    everything else waits for the full transcript. Returns None otherwise.
+    """
+    match = re.match(r'^(?:please\s+)?(open|launch|start|run)\s+(.+)$', partial_text.lower().strip())
+    if not match:
+        return None
+    app_name = match.group(2).strip()
+    if get_app_index().resolve(app_name):
+        return f"{match.group(1)} {app_name}"
+    return None
+
+
 def extract_app_name(command):
     """Extract app name from voice command."""
     # Remove common command words
     command = re.sub(r'\b(open|launch|start|run|please|can you|could you)\b', '', command)
+    # Drop spoken lead-ins ("okay", "and", ...) so they do not become part of the name
+    command = re.sub(r'^(?:(?:okay|ok|alright|all right|so|now|yeah|and|then)\b[\s,]*)+', '', command.strip())
     command = command.strip()
 
-    # Load app mappings to check against known apps
-    app_map = load_app_mappings()
-
-    # Try to find exact matches first
-    words = command.split()
-
-    # Check for multi-word app names
-    for i in range(len(words), 0, -1):
-        for j in range(len(words) - i + 1):
-            potential_app = ' '.join(words[j:j+i])
-            if potential_app in app_map:
-                return potential_app
+    # Longest known app name in the command, e.g. "firefox private browsing"
+    app_name = get_app_index().find_in(command)
+    if app_name:
+        return app_name
 
     # If no exact match, return the cleaned command for fuzzy matching
     return command if command else None
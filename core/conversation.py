@@ -1,15 +1,89 @@
-from core.openrouter_client import OpenRouterClient
-from core.tts import speak
+import re
+import threading
 
-# Initialize client with error handling
+from core.conversation_memory import ConversationMemory
+from core.llm_providers import create_provider
+from core.resilience import DeadlineExceeded, ServiceUnavailable
+from core.response_cache import ResponseCache, create_embedder
+from core.sentence_segmenter import SentenceSegmenter
+from core.tts import speak, speak_stream, stop_speaking
+from core.voice_input import BARGE_IN, watch_for_barge_in
+
+SYSTEM_PROMPT = ("Your name is Sarah, a helpful and respectful AI assistant. "
+                 "You are speaking to your user who you address as 'Sir'. "
+                 "Be polite, concise, and helpful. Avoid emojis in responses. "
+                 "Keep responses brief and natural for voice interaction.")
+
+# Initialize client (OpenRouter or a local model, see SARAH_LLM_PROVIDER) with error handling
 try:
-    client = OpenRouterClient()
-except ValueError as e:
+    client = create_provider()
+    # Connect / load the model and evaluate the system prompt now rather than on the first turn
+    client.start_prewarm(SYSTEM_PROMPT)
+except (ValueError, FileNotFoundError) as e:
     print(f"⚠️ {e}")
     client = None
 
+def _summarize(previous, turns):
+    """Condense turns leaving the memory window with the LLM."""
+    transcript = "\n".join(f"{t['role']}: {t['content']}" for t in turns)
+    # Same system prompt as every turn, so a local model keeps its prompt cache
+    summary = client.get_response_sync([
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": "Summarize this conversation in at most three short sentences. "
+                                    "Keep names, facts and preferences I mentioned.\n\n"
+                                    f"Earlier summary:\n{previous or '(none)'}\n\nNew turns:\n{transcript}"},
+    ])
+    if not summary:
+        raise RuntimeError("empty summary")
+    return summary
+
+memory = ConversationMemory(SYSTEM_PROMPT, summarizer=_summarize if client else None)
+
+response_cache = ResponseCache(embedder=create_embedder())
+
+# Questions that lean on earlier turns ("tell me more about it") are not
+# answered from the cache once a conversation is under way
+_CONTEXT_WORDS = re.compile(r"\b(it|its|that|this|these|those|he|she|him|her|they|them|their|"
+                            r"again|more|else|another|also|why)\b")
+
+# Answers that go stale within minutes ("what time is it", "any news") are
+# never looked up nor stored
+_VOLATILE_WORDS = re.compile(r"\b(time|date|today|tonight|tomorrow|yesterday|now|weather|forecast|"
+                             r"temperature|news|latest|current|currently|score)\b")
+
+def _cacheable(user_text):
+    text = user_text.lower()
+    if _VOLATILE_WORDS.search(text):
+        return False
+    return not memory.turns or not _CONTEXT_WORDS.search(text)
+
+def prewarm():
+    """
+    Get the LLM ready for the coming command: refresh the HTTP connection or
+    prime the local model's prompt cache. Returns immediately.
+    """
+    if client:
+        client.start_prewarm(SYSTEM_PROMPT)
+
+def start_session():
+    """Forget the previous conversation, e.g. when Sarah is woken up again."""
+    memory.reset()
+
+# ReplyStream answering the current turn. Background summaries use their
+# own requests and are never cancelled here.
+_turn_reply = None
+
+def cancel_response():
+    """Abort the reply in progress: this turn's LLM request and speech."""
+    reply = _turn_reply
+    if reply is not None and not reply.finished:
+        reply.cancel()
+        print("[DEBUG] Cancelled in-flight LLM request")
+    stop_speaking()
+
 def handle_conversation(user_text):
     """Handle conversational responses using LLM."""
+    global _turn_reply
     if not client:
         speak("Sorry, I'm unable to process that request right now.")
         return None
@@ -18,22 +92,52 @@ def handle_conversation(user_text):
         speak("I didn't catch that. Could you repeat?")
         return None
     
-    messages = [
-        {
-            "role": "system", 
-            "content": "Your name is Sarah, a helpful and respectful AI assistant. "
-                      "You are speaking to your user who you address as 'Sir'. "
-                      "Be polite, concise, and helpful. Avoid emojis in responses. "
-                      "Keep responses brief and natural for voice interaction."
-        },
-        {"role": "user", "content": user_text.strip()}
-    ]
-    
-    response = client.get_response(messages)
+    user_text = user_text.strip()
+    cacheable = _cacheable(user_text)
+    cached = response_cache.get(user_text) if cacheable else None
+    if cached:
+        stats = response_cache.stats()
+        print(f"[DEBUG] Response cache hit (hit rate {stats['hit_rate']:.0%}, "
+              f"{stats['saved_seconds']:.1f}s of LLM time saved so far)")
+        speak(cached)
+        memory.add("user", user_text)
+        memory.add("assistant", cached)
+        return cached
+
+    # stream_sync sends the request right away; deltas queue up until spoken
+    reply = _turn_reply = client.stream_sync(memory.messages(user_text))
+    done = threading.Event()
+    interrupted = threading.Event()
+
+    def _on_barge_in():
+        interrupted.set()
+        cancel_response()
+
+    if BARGE_IN:
+        watch_for_barge_in(_on_barge_in, done)
+    try:
+        # Speak each sentence as soon as the model has finished writing it
+        response = speak_stream(SentenceSegmenter().segment(reply))
+    finally:
+        done.set()
     
     if response:
-        speak(response)
+        if cacheable and not interrupted.is_set() and "total" in reply.timing:
+            response_cache.put(user_text, response, latency=reply.timing["total"])
+        user_tokens = memory.add("user", user_text)
+        reply_tokens = memory.add("assistant", response)
+        print(f"[DEBUG] Turn tokens: user {user_tokens}, reply {reply_tokens}, "
+              f"history {memory.history_tokens}/{memory.max_tokens}")
+        # Summarize old turns while the user is thinking, not before the next request
+        threading.Thread(target=memory.compact, daemon=True).start()
+        return response
+    elif interrupted.is_set():
         return response
+    elif isinstance(reply.error, (ServiceUnavailable, DeadlineExceeded)):
+        # Known outage: say so right away rather than a generic apology
+        fallback_msg = "I can't reach my language service right now, Sir. Please try again in a minute."
+        speak(fallback_msg)
+        return fallback_msg
     else:
         fallback_msg = "I'm sorry, I couldn't process that request."
         speak(fallback_msg)
@@ -0,0 +1,167 @@
+# core/conversation_memory.py
+
+"""
+Per-session conversation history under a token budget.
+
+The prompt is laid out as
+
+    [system prompt]          fixed for the whole process
+    [summary of old turns]   only rewritten when turns are folded into it
+    [recent turns...]        sliding window
+    [current user message]
+
+so the leading messages stay byte-identical from turn to turn and
+provider-side prompt caching can reuse them. When the history grows past the
+budget, the oldest turns are folded into a rolling summary.
+"""
+
+import math
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+MEMORY_TOKENS = int(os.getenv("SARAH_MEMORY_TOKENS", "1500"))
+
+# Rough per-message cost of role markers in chat formats
+MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (about four characters per token for English).
+
+    Good enough for budgeting; no tokenizer has to be loaded.
+    """
+    return math.ceil(len(text) / 4) + MESSAGE_OVERHEAD if text else MESSAGE_OVERHEAD
+
+
+def extractive_summary(previous: str, turns: List[Dict]) -> str:
+    """Fallback summarizer: keep the first sentence of every folded turn."""
+    lines = [previous] if previous else []
+    for turn in turns:
+        first = turn["content"].split(". ")[0].strip()
+        if len(first) > 120:
+            first = first[:117] + "..."
+        speaker = "User" if turn["role"] == "user" else "Sarah"
+        lines.append(f"{speaker}: {first}")
+    return "\n".join(lines)
+
+
+class ConversationMemory:
+    """
+    Sliding window of recent turns plus a rolling summary of older ones.
+
+    `summarizer(previous_summary, turns) -> str` condenses turns that fall
+    out of the window; it may call an LLM, so `compact()` is meant to run
+    after a reply has been spoken rather than before the next request.
+    """
+
+    def __init__(self, system_prompt: str, max_tokens=MEMORY_TOKENS, min_recent_turns=2,
+                 summary_tokens=None, summarizer: Optional[Callable[[str, List[Dict]], str]] = None,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens
+        self.min_recent_turns = min_recent_turns
+        self.summary_tokens = summary_tokens or max_tokens // 4
+        self.summarizer = summarizer or extractive_summary
+        self.count_tokens = count_tokens
+        self._lock = threading.Lock()
+        # One compaction at a time; the summary is built from the previous one
+        self._compacting = threading.Lock()
+        # Bumped by reset(); a compaction started before a reset must not
+        # write its summary into the new session
+        self.generation = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new session: forget every turn and the summary."""
+        with self._lock:
+            self.generation += 1
+            self.turns: List[Dict] = []  # {"role", "content", "tokens"}
+            self.summary = ""
+            self.summary_token_count = 0
+            self.folded_turns = 0
+
+    def add(self, role: str, content: str) -> int:
+        """Record a message and return its token count."""
+        tokens = self.count_tokens(content)
+        with self._lock:
+            self.turns.append({"role": role, "content": content, "tokens": tokens})
+        return tokens
+
+    @property
+    def history_tokens(self) -> int:
+        with self._lock:
+            return self.summary_token_count + sum(t["tokens"] for t in self.turns)
+
+    def messages(self, user_text: Optional[str] = None) -> List[Dict]:
+        """Prompt for the next request, optionally ending with a new user message."""
+        with self._lock:
+            messages = [{"role": "system", "content": self.system_prompt}]
+            if self.summary:
+                messages.append({"role": "system",
+                                 "content": f"Summary of the earlier conversation:\n{self.summary}"})
+            messages += [{"role": t["role"], "content": t["content"]} for t in self.turns]
+        if user_text is not None:
+            messages.append({"role": "user", "content": user_text})
+        return messages
+
+    def compact(self):
+        """Fold the oldest turns into the summary until the history fits the budget."""
+        with self._compacting:
+            self._compact()
+
+    def _compact(self):
+        with self._lock:
+            overflow = self.summary_token_count + sum(t["tokens"] for t in self.turns) - self.max_tokens
+            if overflow <= 0:
+                return
+            folded = []
+            while overflow > 0 and len(self.turns) > self.min_recent_turns:
+                turn = self.turns.pop(0)
+                folded.append(turn)
+                overflow -= turn["tokens"]
+            # Never start the window on an assistant reply
+            while self.turns and self.turns[0]["role"] != "user" and len(self.turns) > 1:
+                folded.append(self.turns.pop(0))
+            previous = self.summary
+            generation = self.generation
+        if not folded:
+            return
+
+        # Summarizing may take a while; the window is already trimmed
+        try:
+            summary = self.summarizer(previous, folded)
+        except Exception as e:
+            print(f"⚠️ Conversation summary failed, keeping an extractive one: {e}")
+            summary = extractive_summary(previous, folded)
+        summary = self._truncate(summary or "")
+
+        with self._lock:
+            if self.generation != generation:
+                print("[DEBUG] Session was reset while summarizing; dropping the summary")
+                return
+            self.summary = summary
+            self.summary_token_count = self.count_tokens(summary) if summary else 0
+            self.folded_turns += len(folded)
+        print(f"[DEBUG] Folded {len(folded)} turns into the conversation summary "
+              f"({self.summary_token_count} tokens)")
+
+    def _truncate(self, summary: str) -> str:
+        """Keep the most recent lines of a summary that outgrew its share."""
+        lines = summary.splitlines()
+        while len(lines) > 1 and self.count_tokens("\n".join(lines)) > self.summary_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    def stats(self) -> dict:
+        """Token usage, for diagnostics."""
+        with self._lock:
+            return {
+                "system_tokens": self.count_tokens(self.system_prompt),
+                "summary_tokens": self.summary_token_count,
+                "turn_tokens": [t["tokens"] for t in self.turns],
+                "history_tokens": self.summary_token_count + sum(t["tokens"] for t in self.turns),
+                "folded_turns": self.folded_turns,
+                "max_tokens": self.max_tokens,
+            }
@@ -0,0 +1,121 @@
+# core/intent_matcher.py
+
+"""
+Compiled trigger-phrase matching for command routing.
+
+Every trigger phrase of every intent is stored in one token trie, so a
+command is scanned once, matches only whole words ("hi" does not match
+inside "this") and the cost depends on the command length, not on how many
+intents or phrases are registered.
+
+A match scores the intent's weight, a small bonus per extra word of the
+phrase, and full weight only when the phrase starts the command (after
+filler such as "please" or "can you"); elsewhere it counts half.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+# Words that may precede the actual command without making it less direct
+DEFAULT_FILLERS = ["please", "sarah", "hey sarah", "can you", "could you", "would you",
+                   "i want to", "i need to", "i'd like to", "go ahead and", "just",
+                   # Spoken lead-ins: "okay open firefox", "and launch discord"
+                   "okay", "ok", "alright", "all right", "so", "now", "yeah", "and", "then"]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class IntentMatch:
+    """One intent found in a command, with its best-scoring trigger phrase."""
+
+    def __init__(self, intent: str, phrase: str, start: int, end: int, anchored: bool, score: float):
+        self.intent = intent
+        self.phrase = phrase
+        self.start = start  # token positions, end exclusive
+        self.end = end
+        self.anchored = anchored
+        self.score = score
+
+    def __repr__(self):
+        return f"IntentMatch({self.intent!r}, {self.phrase!r}, score={self.score:.2f})"
+
+
+class _Node:
+    __slots__ = ("children", "intents")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.intents: Dict[str, str] = {}  # intent -> phrase ending here
+
+
+class IntentMatcher:
+    """Token trie over the trigger phrases of all intents."""
+
+    def __init__(self, fillers=DEFAULT_FILLERS, unanchored_factor=0.5, length_bonus=0.25):
+        self.unanchored_factor = unanchored_factor
+        self.length_bonus = length_bonus
+        self.weights: Dict[str, float] = {}
+        self._root = _Node()
+        self._fillers = _Node()
+        for filler in fillers:
+            self._insert(self._fillers, tokenize(filler)).intents["filler"] = filler
+
+    @staticmethod
+    def _insert(root: _Node, tokens: List[str]) -> _Node:
+        node = root
+        for token in tokens:
+            node = node.children.setdefault(token, _Node())
+        return node
+
+    def add(self, intent: str, phrases, weight=1.0):
+        """Register trigger phrases for an intent; may be called again to add more."""
+        self.weights[intent] = weight
+        for phrase in phrases:
+            tokens = tokenize(phrase)
+            if not tokens:
+                raise ValueError(f"Empty trigger phrase for intent '{intent}'")
+            self._insert(self._root, tokens).intents[intent] = phrase
+
+    def _skip_fillers(self, tokens: List[str]) -> int:
+        """Index of the first token after any leading filler phrases."""
+        position = 0
+        while True:
+            node, end = self._fillers, None
+            for i in range(position, len(tokens)):
+                node = node.children.get(tokens[i])
+                if node is None:
+                    break
+                if node.intents:
+                    end = i + 1
+            if end is None:
+                return position
+            position = end
+
+    def match(self, text: str) -> List[IntentMatch]:
+        """All intents found in `text`, best first (one match per intent)."""
+        tokens = tokenize(text)
+        command_start = self._skip_fillers(tokens)
+        best: Dict[str, IntentMatch] = {}
+        for start in range(len(tokens)):
+            node = self._root
+            for end in range(start, len(tokens)):
+                node = node.children.get(tokens[end])
+                if node is None:
+                    break
+                for intent, phrase in node.intents.items():
+                    anchored = start == command_start
+                    length = end + 1 - start
+                    score = self.weights[intent] * (1.0 if anchored else self.unanchored_factor)
+                    score += self.length_bonus * (length - 1)
+                    if intent not in best or score > best[intent].score:
+                        best[intent] = IntentMatch(intent, phrase, start, end + 1, anchored, score)
+        return sorted(best.values(), key=lambda m: (m.score, self.weights[m.intent]), reverse=True)
+
+    def best(self, text: str, min_score=0.0) -> Optional[IntentMatch]:
+        """The top match scoring at least `min_score`, or None."""
+        matches = self.match(text)
+        return matches[0] if matches and matches[0].score >= min_score else None
@@ -0,0 +1,225 @@
+# core/keyword_spotter.py
+
+"""
+Offline keyword spotting for the wake word.
+
+Audio is processed frame by frame (the 30 ms frames of the shared microphone
+stream). Each frame becomes one MFCC vector, and the most recent window of
+vectors is compared against enrolled recordings of "Sarah" with subsequence
+DTW. Everything runs locally on the CPU; nothing is sent over the network
+until a wake word has been spotted.
+"""
+
+import glob
+import os
+import time
+import wave
+from typing import List, Optional
+
+import numpy as np
+
+TEMPLATE_DIR = "assets/wake_word"
+
+
+class MfccExtractor:
+    """Computes one MFCC vector per audio frame."""
+
+    def __init__(self, sample_rate=16000, n_fft=512, n_mels=26, n_mfcc=13):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.filters = self._mel_filterbank(n_mels, n_fft, sample_rate)
+        # Orthonormal DCT-II matrix; c0 (overall energy) is dropped later
+        n = np.arange(n_mels)
+        k = np.arange(n_mfcc)[:, None]
+        self.dct = np.sqrt(2.0 / n_mels) * np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))
+        self._windows = {}
+
+    @staticmethod
+    def _mel_filterbank(n_mels, n_fft, sample_rate, fmin=20.0, fmax=None):
+        fmax = fmax or sample_rate / 2
+        to_mel = lambda f: 2595.0 * np.log10(1.0 + f / 700.0)
+        to_hz = lambda m: 700.0 * (10 ** (m / 2595.0) - 1.0)
+        mels = np.linspace(to_mel(fmin), to_mel(fmax), n_mels + 2)
+        bins = np.floor((n_fft + 1) * to_hz(mels) / sample_rate).astype(int)
+        filters = np.zeros((n_mels, n_fft // 2 + 1))
+        for i in range(n_mels):
+            left, center, right = bins[i], bins[i + 1], bins[i + 2]
+            if center > left:
+                filters[i, left:center] = (np.arange(left, center) - left) / (center - left)
+            if right > center:
+                filters[i, center:right] = (right - np.arange(center, right)) / (right - center)
+        return filters
+
+    def __call__(self, samples: np.ndarray) -> np.ndarray:
+        window = self._windows.get(len(samples))
+        if window is None:
+            window = self._windows[len(samples)] = np.hamming(len(samples))
+        x = samples.astype(np.float32) / 32768.0
+        x = np.append(x[0], x[1:] - 0.97 * x[:-1]) * window
+        power = np.abs(np.fft.rfft(x, self.n_fft)) ** 2 / self.n_fft
+        log_mel = np.log(self.filters @ power + 1e-10)
+        return (self.dct @ log_mel)[1:]
+
+    def sequence(self, samples: np.ndarray, frame_samples: int) -> np.ndarray:
+        """MFCC matrix (frames x coefficients) for a whole recording."""
+        count = len(samples) // frame_samples
+        return np.array([self(samples[i * frame_samples:(i + 1) * frame_samples])
+                         for i in range(count)])
+
+
+def _normalize(features: np.ndarray) -> np.ndarray:
+    """Cepstral mean normalization, removes channel/microphone colouring."""
+    return features - features.mean(axis=0)
+
+
+def subsequence_dtw(template: np.ndarray, window: np.ndarray) -> float:
+    """
+    Cost of the best alignment of the whole template against any span of the
+    window, normalized by template length.
+    """
+    cost = np.sqrt(((template[:, None, :] - window[None, :, :]) ** 2).sum(axis=2))
+    acc = cost[0].copy()  # free start anywhere in the window
+    for i in range(1, len(template)):
+        row = np.empty_like(acc)
+        row[0] = acc[0] + cost[i, 0]
+        diag = np.minimum(acc[1:], acc[:-1])
+        for j in range(1, len(acc)):
+            row[j] = cost[i, j] + min(diag[j - 1], row[j - 1])
+        acc = row
+    return float(acc.min()) / len(template)  # free end
+
+
+class WakeWordBackend:
+    """Interface for streaming wake word detectors."""
+
+    def process(self, frame: bytes) -> Optional[str]:
+        """Feed one audio frame. Returns the wake word on a hit, else None."""
+        raise NotImplementedError
+
+    def reset(self):
+        """Forget buffered audio, e.g. after the assistant has spoken."""
+
+
+class TemplateKeywordSpotter(WakeWordBackend):
+    """MFCC + DTW template matcher for a single keyword."""
+
+    def __init__(self, templates: List[np.ndarray], keyword="sarah",
+                 threshold: Optional[float] = None, sample_rate=16000,
+                 hop_frames=3, min_rms=200.0, refractory_s=1.5):
+        if not templates:
+            raise ValueError("At least one wake word template is required")
+        self.keyword = keyword
+        self.extractor = MfccExtractor(sample_rate=sample_rate)
+        self.templates = [_normalize(t) for t in templates]
+        self.threshold = self._calibrate_threshold() if threshold is None else threshold
+        self.window_len = int(max(len(t) for t in self.templates) * 1.5)
+        self.hop_frames = hop_frames
+        self.min_rms = min_rms
+        self.refractory_s = refractory_s
+        self._features = []
+        self._rms = []
+        self._since_check = 0
+        self._last_hit = 0.0
+        self.last_score = None
+
+    def _calibrate_threshold(self, default=6.0, margin=1.5):
+        """Derive the accept threshold from how far the templates are apart."""
+        if len(self.templates) < 2:
+            return default
+        distances = [subsequence_dtw(a, b)
+                     for i, a in enumerate(self.templates)
+                     for j, b in enumerate(self.templates) if i != j]
+        return max(distances) * margin
+
+    def reset(self):
+        self._features.clear()
+        self._rms.clear()
+        self._since_check = 0
+
+    def process(self, frame: bytes) -> Optional[str]:
+        samples = np.frombuffer(frame, dtype=np.int16)
+        self._features.append(self.extractor(samples))
+        self._rms.append(float(np.sqrt(np.mean(samples.astype(np.float32) ** 2))))
+        if len(self._features) > self.window_len:
+            del self._features[0]
+            del self._rms[0]
+
+        self._since_check += 1
+        if self._since_check < self.hop_frames or len(self._features) < self.window_len:
+            return None
+        self._since_check = 0
+
+        # Cheap energy gate: no DTW while the room is quiet
+        if max(self._rms) < self.min_rms:
+            return None
+        if time.time() - self._last_hit < self.refractory_s:
+            return None
+
+        window = _normalize(np.array(self._features))
+        self.last_score = min(subsequence_dtw(t, window) for t in self.templates)
+        if self.last_score <= self.threshold:
+            self._last_hit = time.time()
+            self.reset()
+            return self.keyword
+        return None
+
+
+def _read_wav(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path} must be 16-bit mono")
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def load_templates(template_dir=TEMPLATE_DIR, frame_samples=480) -> List[np.ndarray]:
+    """Load every enrolled wake word recording as an MFCC sequence."""
+    extractor = MfccExtractor()
+    templates = []
+    for path in sorted(glob.glob(os.path.join(template_dir, "*.wav"))):
+        try:
+            templates.append(extractor.sequence(_read_wav(path), frame_samples))
+        except Exception as e:
+            print(f"⚠️ Skipping wake word template {path}: {e}")
+    return [t for t in templates if len(t) > 0]
+
+
+def load_default_spotter() -> Optional[TemplateKeywordSpotter]:
+    """Build the local spotter from enrolled templates, or None if there are none."""
+    templates = load_templates()
+    if not templates:
+        return None
+    threshold = os.getenv("SARAH_KWS_THRESHOLD")
+    return TemplateKeywordSpotter(templates, threshold=float(threshold) if threshold else None)
+
+
+def record_templates(count=3, seconds=1.2, template_dir=TEMPLATE_DIR):
+    """Record wake word samples from the microphone into the template directory."""
+    from core.audio_stream import get_microphone_stream
+
+    stream = get_microphone_stream()
+    os.makedirs(template_dir, exist_ok=True)
+    frames_needed = int(seconds * 1000 / stream.frame_ms)
+    for n in range(count):
+        input(f"Press Enter, then say 'Sarah' ({n + 1}/{count})...")
+        reader = stream.reader()
+        audio = b"".join(reader.read() for _ in range(frames_needed))
+        samples = np.frombuffer(audio, dtype=np.int16)
+
+        # Trim to the loud part so templates do not carry silence
+        frame_rms = np.sqrt(np.mean(samples[:len(samples) // stream.frame_samples * stream.frame_samples]
+                                    .reshape(-1, stream.frame_samples).astype(np.float32) ** 2, axis=1))
+        voiced = np.where(frame_rms > frame_rms.max() * 0.1)[0]
+        if len(voiced):
+            samples = samples[voiced[0] * stream.frame_samples:(voiced[-1] + 1) * stream.frame_samples]
+
+        path = os.path.join(template_dir, f"sarah_{int(time.time())}_{n}.wav")
+        with wave.open(path, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(stream.sample_rate)
+            wf.writeframes(samples.tobytes())
+        print(f"✅ Saved {path}")
+
+
+if __name__ == "__main__":
+    record_templates()
@@ -0,0 +1,263 @@
+# core/llm_providers.py
+
+"""
+Interchangeable LLM backends for the conversation path.
+
+"openrouter" is the cloud client (core/async_openrouter_client.py);
+"llama" runs a local GGUF model through llama-cpp-python so conversations
+also work offline. Select with SARAH_LLM_PROVIDER.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.resilience import ServiceUnavailable
+
+LLM_PROVIDER = os.getenv("SARAH_LLM_PROVIDER", "openrouter").lower()
+LLAMA_MODEL_PATH = os.getenv("SARAH_LLAMA_MODEL", "models/TinyLlama-1.1B-Chat-v1.0-Q4_K_S.gguf")
+# Physical cores work best; hyper-threads mostly add contention
+LLAMA_THREADS = int(os.getenv("SARAH_LLAMA_THREADS", str(max(1, (os.cpu_count() or 2) // 2))))
+LLAMA_CONTEXT = int(os.getenv("SARAH_LLAMA_CONTEXT", "2048"))
+# Voice answers are short; capping generation bounds worst-case latency
+LLAMA_MAX_TOKENS = int(os.getenv("SARAH_LLAMA_MAX_TOKENS", "200"))
+# Longest a request waits for the model to finish loading
+LLAMA_READY_TIMEOUT = 120
+
+
+class ReplyStream:
+    """
+    Iterator over the text deltas of one reply, produced in the background.
+
+    The request is already running when the stream is handed out, so a reply
+    can be started speculatively and consumed (or dropped with `cancel()`)
+    later. Producers fill in `timing` and `error` for this reply only, then
+    put None on the queue when it ends; both are final once iteration stops.
+    """
+
+    def __init__(self, deltas: queue.Queue, on_cancel: Callable[[], None]):
+        self._deltas = deltas
+        self._on_cancel = on_cancel
+        self._finished = False
+        # e.g. {"model": ..., "first_token": s, "total": s}; "total" only if the reply completed
+        self.timing: Dict[str, object] = {}
+        # Why the reply failed, if it did (e.g. core.resilience.CircuitOpenError)
+        self.error: Optional[Exception] = None
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if self._finished:
+            raise StopIteration
+        delta = self._deltas.get()
+        if delta is None:
+            self.cancel()
+            raise StopIteration
+        return delta
+
+    def cancel(self):
+        """Stop this reply only; iteration ends. Safe to call repeatedly."""
+        if not self._finished:
+            self._finished = True
+            self._on_cancel()
+
+
+class LLMProvider:
+    """
+    Interface used by core/conversation.py.
+
+    Methods are synchronous and safe to call from the voice loop. Timing and
+    errors are reported per reply on the ReplyStream, since several replies
+    (a turn and a background summary) may run at once.
+    """
+
+    name = "base"
+
+    def start_prewarm(self, system_prompt: Optional[str] = None):
+        """
+        Get ready for the next request (connections, model, prompt cache).
+        Called at startup and again on every wake word; must not block.
+        """
+
+    def stream_sync(self, messages: List[Dict]) -> ReplyStream:
+        """Start a reply and return its text deltas. Yields nothing on failure; see `.error`."""
+        raise NotImplementedError
+
+    def get_response_sync(self, messages: List[Dict]) -> Optional[str]:
+        return "".join(self.stream_sync(messages)) or None
+
+    def cancel(self) -> int:
+        """Cancel every in-flight reply; returns how many were cancelled. See also ReplyStream.cancel()."""
+        return 0
+
+
+class LlamaCppProvider(LLMProvider):
+    """
+    Local GGUF model via llama-cpp-python.
+
+    The model is loaded once, in the background, with memory-mapped weights.
+    llama.cpp keeps the KV cache of the longest prompt prefix shared with the
+    previous request, and every prompt starts with the same system message,
+    so that prefix is evaluated once at warm-up and never again.
+    """
+
+    name = "llama"
+
+    def __init__(self, model_path=LLAMA_MODEL_PATH, n_threads=LLAMA_THREADS, n_ctx=LLAMA_CONTEXT,
+                 max_tokens=LLAMA_MAX_TOKENS, temperature=0.7):
+        super().__init__()
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(f"Local LLM model not found: {model_path} (set SARAH_LLAMA_MODEL)")
+        self.model_path = model_path
+        self.n_threads = n_threads
+        self.n_ctx = n_ctx
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.initialization_error = None
+        self._llm = None
+        self._ready = threading.Event()
+        self._started = False
+        # llama.cpp contexts are not thread-safe: one generation at a time
+        self._lock = threading.Lock()
+        self._active = set()  # cancel flags of replies being generated
+
+    def _load(self, system_prompt):
+        try:
+            from llama_cpp import Llama
+
+            print(f"🔄 Loading local LLM {os.path.basename(self.model_path)} ({self.n_threads} threads)...")
+            start = time.time()
+            self._llm = Llama(model_path=self.model_path, n_ctx=self.n_ctx, n_threads=self.n_threads,
+                              use_mmap=True, verbose=False)
+            if system_prompt:
+                with self._lock:
+                    self._prime(system_prompt)
+            print(f"✅ Local LLM ready in {time.time() - start:.2f} seconds.")
+        except Exception as e:
+            self.initialization_error = e
+            print(f"❌ Local LLM failed to load: {e}")
+        finally:
+            self._ready.set()
+
+    def _prime(self, system_prompt):
+        # Evaluate the fixed prefix now so the next real turn reuses it
+        self._llm.create_chat_completion(
+            messages=[{"role": "system", "content": system_prompt},
+                      {"role": "user", "content": "Hello."}],
+            max_tokens=1,
+        )
+
+    def _reprime(self, system_prompt):
+        # Skip if a reply is being generated: it keeps the prefix warm anyway
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            start = time.time()
+            self._prime(system_prompt)
+            print(f"[DEBUG] Local LLM prompt cache primed in {time.time() - start:.2f}s")
+        except Exception as e:
+            print(f"⚠️ Could not prime the local LLM: {e}")
+        finally:
+            self._lock.release()
+
+    def start_prewarm(self, system_prompt: Optional[str] = None):
+        """
+        Load the model on first use; afterwards, re-evaluate the system prompt
+        so the KV cache holds it (and the mmapped weights are paged back in)
+        before the next turn.
+        """
+        if not self._started:
+            self._started = True
+            threading.Thread(target=self._load, args=(system_prompt,), daemon=True).start()
+        elif system_prompt and self._ready.is_set() and self._llm is not None:
+            threading.Thread(target=self._reprime, args=(system_prompt,), daemon=True).start()
+
+    def _generate(self, messages, deltas, cancelled, reply):
+        try:
+            if not self._ready.is_set():
+                print("⏳ Waiting for the local LLM to load...")
+            if not self._ready.wait(LLAMA_READY_TIMEOUT) or self._llm is None:
+                reason = self.initialization_error or 'still loading'
+                print(f"⚠️ Local LLM unavailable ({reason}).")
+                reply.error = ServiceUnavailable(f"Local LLM unavailable ({reason})")
+                return
+            with self._lock:
+                self._run(messages, deltas, cancelled, reply)
+        finally:
+            deltas.put(None)
+
+    def _run(self, messages, deltas, cancelled, reply):
+        start = time.time()
+        first = True
+        try:
+            chunks = self._llm.create_chat_completion(messages=messages, max_tokens=self.max_tokens,
+                                                      temperature=self.temperature, stream=True)
+            for chunk in chunks:
+                if cancelled.is_set():
+                    print("[DEBUG] Local LLM generation cancelled")
+                    chunks.close()
+                    return
+                delta = chunk["choices"][0].get("delta", {}).get("content")
+                if not delta:
+                    continue
+                if first:
+                    reply.timing.update(model=self.name, first_token=time.time() - start)
+                    print(f"[DEBUG] Local LLM: first token after {reply.timing['first_token']:.2f}s")
+                    first = False
+                deltas.put(delta)
+            reply.timing["total"] = time.time() - start
+        except Exception as e:
+            print(f"❌ Local LLM generation failed: {e}")
+            reply.error = e
+
+    def stream_sync(self, messages: List[Dict]) -> ReplyStream:
+        self.start_prewarm()
+        # Generate on a worker thread so tokens keep coming while the caller
+        # is busy synthesizing speech for the previous sentence
+        cancelled = threading.Event()
+        self._active.add(cancelled)
+        deltas = queue.Queue()
+
+        def _release():
+            cancelled.set()
+            self._active.discard(cancelled)
+
+        reply = ReplyStream(deltas, _release)
+        threading.Thread(target=self._generate, args=(messages, deltas, cancelled, reply), daemon=True).start()
+        return reply
+
+    def cancel(self) -> int:
+        active = list(self._active)
+        for cancelled in active:
+            cancelled.set()
+        return len(active)
+
+
+def _openrouter_provider():
+    from core.async_openrouter_client import AsyncOpenRouterClient
+    from core.model_router import ModelRouter, ROUTER_ENABLED
+    return AsyncOpenRouterClient(router=ModelRouter() if ROUTER_ENABLED else None)
+
+
+PROVIDERS = {
+    "openrouter": _openrouter_provider,
+    "llama": LlamaCppProvider,
+}
+
+
+def create_provider(name: Optional[str] = None) -> LLMProvider:
+    """
+    Build the configured provider. Raises ValueError/FileNotFoundError if it
+    cannot be used (missing API key, missing model file, unknown name).
+    """
+    name = (name or LLM_PROVIDER).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider '{name}'. Choose from: {', '.join(PROVIDERS)}")
+    return PROVIDERS[name]()
@@ -0,0 +1,156 @@
+# core/model_router.py
+
+"""
+Per-request model selection for the OpenRouter path.
+
+Each request is classified as short chit-chat or longer reasoning. Among
+the models suitable for that class, the cheapest one whose rolling p95
+time-to-first-token fits the class's latency budget is used, and the next
+healthy candidate is handed to the client as its hedge / failover model.
+Models that keep failing are benched for a cool-down period.
+
+Latencies come from the client's LatencyRecord, the same samples its hedge
+delay is computed from. Routing is opt-in (SARAH_LLM_ROUTER=1); by default
+the client's configured model is used for every request.
+"""
+
+import collections
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.async_openrouter_client import LatencyRecord
+
+# p95 time-to-first-token budgets in seconds
+BUDGETS = {
+    "chat": float(os.getenv("SARAH_LLM_BUDGET_CHAT", "1.5")),
+    "reasoning": float(os.getenv("SARAH_LLM_BUDGET_REASONING", "4.0")),
+}
+ROUTER_ENABLED = os.getenv("SARAH_LLM_ROUTER", "0") == "1"
+# Samples needed before a model's p95 is compared with the budget
+MIN_SAMPLES = 5
+
+_REASONING = re.compile(r"\b(explain|why|how (?:does|do|can|would)|compare|difference|analy[sz]e|plan|"
+                        r"write|story|poem|code|calculate|step by step|summari[sz]e|pros and cons)\b")
+
+
+class ModelSpec:
+    """A routable model: relative cost and the request classes it is good enough for."""
+
+    def __init__(self, name: str, cost: float, classes=("chat", "reasoning")):
+        self.name = name
+        self.cost = cost
+        self.classes = tuple(classes)
+
+
+# From assets/llms/openrouter_models.txt, cheapest first within similar speed
+DEFAULT_MODELS = [
+    ModelSpec("openrouter/sonoma-dusk-alpha", cost=0.0),
+    ModelSpec("google/gemma-3n-e2b-it:free", cost=0.0, classes=("chat",)),
+    ModelSpec("mistralai/mistral-small-3.2-24b-instruct:free", cost=0.1),
+    ModelSpec("openrouter/sonoma-sky-alpha", cost=0.2),
+    ModelSpec("deepseek/deepseek-chat-v3-0324:free", cost=0.3, classes=("reasoning",)),
+]
+
+
+def classify(messages: List[Dict]) -> str:
+    """'reasoning' for long or analytical requests, otherwise 'chat'."""
+    user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    text = user.lower()
+    if len(text.split()) > 20 or _REASONING.search(text):
+        return "reasoning"
+    return "chat"
+
+
+class ModelStats:
+    """Rolling outcome window for one model."""
+
+    def __init__(self, window=50, failure_threshold=3, cooldown_s=60.0):
+        self.outcomes = collections.deque(maxlen=window)  # True = success
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.consecutive_failures = 0
+        self.benched_until = 0.0
+
+    def record_success(self):
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self.benched_until = time.time() + self.cooldown_s
+
+    @property
+    def failure_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.time() >= self.benched_until
+
+
+class ModelRouter:
+    """Picks (primary, backup) models for a request by class, budget and health."""
+
+    def __init__(self, models: List[ModelSpec] = None, budgets: Dict[str, float] = None,
+                 max_failure_rate=0.5, latencies: LatencyRecord = None):
+        self.models = sorted(models or DEFAULT_MODELS, key=lambda m: m.cost)
+        self.budgets = budgets or BUDGETS
+        self.max_failure_rate = max_failure_rate
+        self.latencies = latencies if latencies is not None else LatencyRecord()
+        self._stats = {m.name: ModelStats() for m in self.models}
+        self._lock = threading.Lock()
+
+    def stats(self, model: str) -> ModelStats:
+        with self._lock:
+            return self._stats.setdefault(model, ModelStats())
+
+    def record_success(self, model: str):
+        """Count a successful request; its latency goes to the shared LatencyRecord."""
+        stats = self.stats(model)
+        with self._lock:
+            stats.record_success()
+
+    def record_failure(self, model: str):
+        stats = self.stats(model)
+        with self._lock:
+            stats.record_failure()
+            if not stats.healthy:
+                print(f"⚠️ {model} keeps failing; routing around it for {stats.cooldown_s:.0f}s")
+
+    def _usable(self, stats: ModelStats) -> bool:
+        return stats.healthy and (len(stats.outcomes) < 4 or stats.failure_rate <= self.max_failure_rate)
+
+    def choose(self, messages: List[Dict]) -> Tuple[str, Optional[str]]:
+        """Return (primary, backup) for a request; backup may be None."""
+        request_class = classify(messages)
+        budget = self.budgets.get(request_class, max(self.budgets.values()))
+        with self._lock:
+            candidates = [m for m in self.models if request_class in m.classes]
+            usable = [m for m in candidates if self._usable(self._stats[m.name])] or candidates
+        p95 = {m.name: self.latencies.p95(m.name, MIN_SAMPLES) for m in usable}
+
+        # Cheapest first; models without enough samples are given a chance
+        within = [m for m in usable if p95[m.name] is None or p95[m.name] <= budget]
+        if within:
+            ranked = within + [m for m in usable if m not in within]
+        else:
+            # Nobody meets the budget: fastest first
+            ranked = sorted(usable, key=lambda m: p95[m.name])
+        primary = ranked[0].name
+        backup = ranked[1].name if len(ranked) > 1 else None
+        print(f"[DEBUG] Router: {request_class} request (budget {budget:.1f}s) -> {primary}"
+              f"{f', backup {backup}' if backup else ''}")
+        return primary, backup
+
+    def report(self) -> Dict[str, dict]:
+        """Per-model p95 latency and failure rate, for diagnostics."""
+        with self._lock:
+            stats = dict(self._stats)
+        return {name: {"p95": self.latencies.p95(name, MIN_SAMPLES), "failure_rate": round(s.failure_rate, 2),
+                       "samples": len(s.outcomes), "healthy": s.healthy}
+                for name, s in stats.items()}
@@ -0,0 +1,242 @@
+# core/resilience.py
+
+"""
+Shared failure handling for calls to external services.
+
+- CircuitBreaker: after repeated failures an endpoint is "open" and calls
+  fail immediately instead of waiting for timeouts; after a cool-down one
+  trial call is let through to see whether it recovered.
+- RetryBudget: retries are only allowed while they stay a small fraction
+  of all calls, so an outage does not multiply traffic (or latency).
+- Deadline: the time left for the current user turn, propagated through a
+  context variable so every call clamps its timeout to it.
+- backoff_delay: exponential backoff with full jitter.
+
+`call()` combines all of them for synchronous calls; the async OpenRouter
+client uses the pieces directly.
+"""
+
+import contextlib
+import contextvars
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+# Time budget for handling one spoken command, including every external call
+TURN_DEADLINE = float(os.getenv("SARAH_TURN_DEADLINE", "30"))
+
+
+class ServiceUnavailable(Exception):
+    """An external service could not be reached (after any retries)."""
+
+
+class CircuitOpenError(ServiceUnavailable):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"{endpoint} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the current turn has no time left for another call."""
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures -> half-open after `reset_timeout`."""
+
+    def __init__(self, name: str, failure_threshold=3, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.time() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        """Raise CircuitOpenError unless a call may go ahead now."""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return
+            if state == "half_open" and not self._trial_in_flight:
+                # Exactly one trial call probes whether the endpoint recovered
+                self._trial_in_flight = True
+                return
+            retry_in = max(0.0, self.reset_timeout - (time.time() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_in)
+
+    def release(self):
+        """The call was abandoned (e.g. cancelled) without an outcome."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    print(f"⚠️ {self.name} is failing; pausing calls for {self.reset_timeout:.0f}s")
+                self._opened_at = time.time()
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to roughly `ratio` of calls.
+
+    Every call deposits `ratio` tokens (up to `max_tokens`); every retry
+    spends one.
+    """
+
+    def __init__(self, ratio=0.2, max_tokens=5.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def record_call(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class Deadline:
+    """Absolute point in time by which the current turn must be done."""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.time() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.time())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def timeout(self, default: float) -> float:
+        """`default`, shortened to the time left; raises if none is left."""
+        remaining = self.remaining()
+        if remaining <= 0.0:
+            raise DeadlineExceeded("deadline exceeded")
+        return min(default, remaining)
+
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    """Run a block with a deadline; a tighter enclosing deadline wins."""
+    outer = _current_deadline.get()
+    inner = Deadline(seconds)
+    if outer is not None and outer.expires_at < inner.expires_at:
+        inner = outer
+    token = _current_deadline.set(inner)
+    try:
+        yield inner
+    finally:
+        _current_deadline.reset(token)
+
+
+def backoff_delay(attempt: int, base=0.25, cap=4.0) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+# Per-endpoint registries
+_breakers = {}
+_budgets = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str, **kwargs) -> CircuitBreaker:
+    with _registry_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint, **kwargs)
+        return _breakers[endpoint]
+
+
+def get_retry_budget(endpoint: str) -> RetryBudget:
+    with _registry_lock:
+        if endpoint not in _budgets:
+            _budgets[endpoint] = RetryBudget()
+        return _budgets[endpoint]
+
+
+def call(endpoint: str, fn: Callable[[float], object], timeout=10.0, retries=1,
+         retry_on=(Exception,), is_failure: Callable[[object], bool] = None):
+    """
+    Call `fn(timeout)` for an endpoint with a circuit breaker, jittered
+    retries drawn from the endpoint's retry budget, and the timeout clamped
+    to the current deadline.
+
+    `is_failure(result)` marks results (e.g. HTTP 5xx responses) that count
+    against the circuit and may be retried; such a result is returned as-is
+    if no retry is possible. Raises CircuitOpenError or DeadlineExceeded
+    without calling `fn` when there is no point trying.
+    """
+    breaker = get_breaker(endpoint)
+    budget = get_retry_budget(endpoint)
+    budget.record_call()
+    attempt = 0
+    while True:
+        active = current_deadline()
+        call_timeout = active.timeout(timeout) if active else timeout
+        breaker.allow()
+        try:
+            result = fn(call_timeout)
+        except retry_on as e:
+            breaker.record_failure()
+            error, result = e, None
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            if is_failure is None or not is_failure(result):
+                breaker.record_success()
+                return result
+            breaker.record_failure()
+            error = None
+
+        delay = backoff_delay(attempt)
+        out_of_time = active is not None and active.remaining() <= delay
+        if attempt >= retries or out_of_time or not budget.try_spend():
+            if error is not None:
+                raise error
+            return result
+        print(f"🔁 Retrying {endpoint} in {delay:.2f}s (attempt {attempt + 2}/{retries + 1})")
+        time.sleep(delay)
+        attempt += 1
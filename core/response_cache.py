@@ -0,0 +1,253 @@
+# core/response_cache.py
+
+"""
+Local cache of conversational LLM answers.
+
+Questions are looked up first by normalized text, then (optionally) by
+embedding similarity against a small on-disk vector index, so "tell me a
+joke" and "tell me a joke please" reuse one answer without a network round
+trip. Entries expire after a TTL and the least recently used are evicted
+beyond a size cap.
+"""
+
+import collections
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Optional
+
+import numpy as np
+
+CACHE_DIR = os.getenv("SARAH_RESPONSE_CACHE_DIR", "cache/responses")
+CACHE_TTL_HOURS = float(os.getenv("SARAH_RESPONSE_CACHE_TTL_HOURS", "6"))
+CACHE_MAX_ENTRIES = int(os.getenv("SARAH_RESPONSE_CACHE_SIZE", "500"))
+# Embedding tier: "" (off), "hashing" (built in) or "minilm" (sentence-transformers)
+CACHE_EMBEDDER = os.getenv("SARAH_RESPONSE_CACHE_EMBEDDER", "").lower()
+CACHE_SIMILARITY = float(os.getenv("SARAH_RESPONSE_CACHE_SIMILARITY", "0.92"))
+
+# Fillers that do not change what is being asked
+_FILLER_PREFIX = re.compile(r"^(?:(?:hey|ok|okay)\s+)?(?:sarah\s+)?(?:please\s+)?(?:can you\s+|could you\s+)?")
+_FILLER_SUFFIX = re.compile(r"\s+(?:please|sir|for me)$")
+
+
+def normalize_question(text: str) -> str:
+    """Lower-case, drop punctuation and polite fillers, collapse whitespace."""
+    text = re.sub(r"[^\w\s']", " ", text.lower())
+    text = " ".join(text.split())
+    text = _FILLER_PREFIX.sub("", text)
+    while _FILLER_SUFFIX.search(text):
+        text = _FILLER_SUFFIX.sub("", text)
+    return text.strip()
+
+
+class HashingEmbedder:
+    """
+    Dependency-free embedding: hashed character trigrams and words.
+
+    Catches rephrasings that differ by a word or two; it has no notion of
+    synonyms, so keep the similarity threshold high.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim=512):
+        self.dim = dim
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        padded = f" {text} "
+        features = [padded[i:i + 3] for i in range(len(padded) - 2)] + [f"w:{w}" for w in text.split()]
+        for feature in features:
+            vector[zlib.crc32(feature.encode("utf-8")) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SentenceTransformerEmbedder:
+    """Small sentence-transformers model; loaded on first use."""
+
+    name = "minilm"
+
+    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2"):
+        self.model_name = model_name
+        self._model = None
+
+    def embed(self, text: str) -> np.ndarray:
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return np.asarray(self._model.encode(text, normalize_embeddings=True), dtype=np.float32)
+
+
+EMBEDDERS = {
+    "hashing": HashingEmbedder,
+    "minilm": SentenceTransformerEmbedder,
+}
+
+
+def create_embedder(name: str = CACHE_EMBEDDER):
+    """Build the configured embedder, or None when the semantic tier is off."""
+    if not name:
+        return None
+    if name not in EMBEDDERS:
+        raise ValueError(f"Unknown response cache embedder '{name}'. Choose from: {', '.join(EMBEDDERS)}")
+    return EMBEDDERS[name]()
+
+
+class ResponseCache:
+    """
+    Exact + semantic answer cache with TTL and LRU eviction.
+
+    Entries live in `entries.json`; when an embedder is configured their
+    vectors are kept row-aligned in `vectors.npy` next to it.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_entries=CACHE_MAX_ENTRIES, ttl_s=CACHE_TTL_HOURS * 3600,
+                 embedder=None, similarity=CACHE_SIMILARITY):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.embedder = embedder
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()  # normalized question -> entry, least recent first
+        self._vectors = {}
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._load()
+
+    # --- Persistence ---
+
+    def _paths(self):
+        return os.path.join(self.directory, "entries.json"), os.path.join(self.directory, "vectors.npy")
+
+    def _load(self):
+        entries_path, vectors_path = self._paths()
+        if not os.path.isfile(entries_path):
+            return
+        try:
+            with open(entries_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ignoring unreadable response cache {entries_path}: {e}")
+            return
+        for entry in sorted(data.get("entries", []), key=lambda e: e["last_used"]):
+            self._entries[entry["key"]] = entry
+
+        # Vectors are only reusable if they came from the same embedder
+        if self.embedder is not None and data.get("embedder") == self.embedder.name \
+                and os.path.isfile(vectors_path):
+            matrix = np.load(vectors_path)
+            for key, row in zip(data.get("vector_keys", []), matrix):
+                if key in self._entries:
+                    self._vectors[key] = row
+
+    def _save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        entries_path, vectors_path = self._paths()
+        with self._lock:
+            entries = list(self._entries.values())
+            vector_keys = list(self._vectors)
+            matrix = np.stack([self._vectors[k] for k in vector_keys]) if vector_keys else None
+        data = {
+            "embedder": self.embedder.name if self.embedder is not None else None,
+            "entries": entries,
+            "vector_keys": vector_keys,
+        }
+        tmp_path = f"{entries_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, entries_path)
+        if matrix is not None:
+            tmp_path = f"{vectors_path}.{threading.get_ident()}.tmp.npy"
+            np.save(tmp_path, matrix)
+            os.replace(tmp_path, vectors_path)
+
+    # --- Lookup ---
+
+    def _expired(self, entry, now) -> bool:
+        return now - entry["created"] > self.ttl_s
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self._vectors.pop(key, None)
+
+    def _nearest(self, vector, now):
+        """Most similar live entry above the threshold, as (key, score)."""
+        if not self._vectors:
+            return None, 0.0
+        keys = list(self._vectors)
+        scores = np.stack([self._vectors[k] for k in keys]) @ vector
+        for i in np.argsort(-scores):
+            if scores[i] < self.similarity:
+                break
+            if not self._expired(self._entries[keys[i]], now):
+                return keys[i], float(scores[i])
+        return None, 0.0
+
+    def get(self, question: str) -> Optional[str]:
+        """Return a cached answer for the question, or None on a miss."""
+        key = normalize_question(question)
+        if not key:
+            return None
+        now = time.time()
+        vector = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, now):
+                self._drop(key)
+                entry = None
+            semantic = False
+            if entry is None and self.embedder is not None:
+                vector = self.embedder.embed(key)
+                match, score = self._nearest(vector, now)
+                if match is not None:
+                    print(f"[DEBUG] Response cache: '{key}' matched '{match}' ({score:.2f})")
+                    entry, semantic = self._entries[match], True
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(entry["key"])
+            entry["last_used"] = now
+            self.hits += 1
+            self.semantic_hits += semantic
+            self.saved_seconds += entry.get("latency", 0.0)
+            return entry["response"]
+
+    def put(self, question: str, response: str, latency: float = 0.0):
+        """Store an answer along with how long the LLM took to produce it."""
+        key = normalize_question(question)
+        if not key or not response:
+            return
+        now = time.time()
+        vector = self.embedder.embed(key) if self.embedder is not None else None
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = {"key": key, "response": response, "created": now,
+                                  "last_used": now, "latency": latency}
+            if vector is not None:
+                self._vectors[key] = vector
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+        try:
+            self._save()
+        except OSError as e:
+            print(f"⚠️ Could not save response cache: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": round(self.saved_seconds, 2),
+            }
@@ -0,0 +1,67 @@
+# core/sentence_segmenter.py
+
+import re
+from typing import Iterable, Iterator, List
+
+# Words ending in a period that do not end a sentence
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc",
+    "e.g", "i.e", "approx", "no", "fig", "inc", "ltd",
+}
+
+# Sentence end: terminal punctuation, optional closing quote/bracket, then whitespace
+_BOUNDARY = re.compile(r'([.!?]+["\')\]]*)\s+')
+
+
+class SentenceSegmenter:
+    """
+    Incrementally splits streamed text into complete sentences.
+
+    Feed LLM deltas as they arrive; every sentence is returned as soon as the
+    whitespace after its final punctuation has been seen, so speech can start
+    while later tokens are still being generated.
+    """
+
+    def __init__(self, min_chars=12):
+        # Very short sentences ("Sure.") are merged with the next one so the
+        # TTS engine is not asked for tiny, choppy clips
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def _is_boundary(self, text: str, end: int) -> bool:
+        before = text[:end].rstrip('.!?"\')]')
+        word = before.split()[-1].lower() if before.split() else ""
+        if word in ABBREVIATIONS:
+            return False
+        # Single capital initials such as "J. R. R."
+        if len(word) == 1 and word.isalpha():
+            return False
+        return True
+
+    def feed(self, delta: str) -> List[str]:
+        """Add streamed text and return any sentences it completed."""
+        self._buffer += delta
+        sentences = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            if not self._is_boundary(self._buffer, match.end(1)):
+                continue
+            sentence = self._buffer[start:match.end(1)].strip()
+            if len(sentence) < self.min_chars:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever text is left once the stream has finished."""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return [rest] if rest else []
+
+    def segment(self, deltas: Iterable[str]) -> Iterator[str]:
+        """Turn an iterable of text deltas into an iterator of sentences."""
+        for delta in deltas:
+            yield from self.feed(delta)
+        yield from self.flush()
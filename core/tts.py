@@ -1,64 +1,361 @@
-from kokoro import KPipeline
-import sounddevice as sd
+import numpy as np
 import soundfile as sf
+import json
 import os
+import queue
 import threading  # Use threading to avoid blocking the main thread during initialization
+import time
+
+from core.tts_cache import TTSCache, MODEL_VERSION, normalize_text
+
+SAMPLE_RATE = 24000  # Kokoro output rate
+
+# Written by assets/tts/prerender_phrases.py
+PRERENDER_DIR = "audio_responses/prerendered"
+
+# Recordings shipped with the repo (af_heart, normal speed), played when no
+# pre-rendered or cached audio exists yet instead of waiting for Kokoro
+CLIPS = {
+    "yes, sir?": "audio_responses/yes_sir.wav",
+    "how may i assist you, sir?": "audio_responses/how_may_i_assist.wav",
+    "anything else, sir?": "audio_responses/anything_else.wav",
+    "you're welcome, sir. i live to serve.": "audio_responses/youre_welcome.wav",
+    "goodbye, sir!": "audio_responses/goodbye.wav",
+}
+CLIP_VOICE = "af_heart"
 
 # Global variables
 pipeline = None
 initialized = False
+initialization_error = None
+_ready = threading.Event()
+_progress_callbacks = []
+
+# Longest a speech request waits for the pipeline before giving up on audio
+READY_TIMEOUT = 120
+
+def _report_progress(stage: str):
+    for callback in list(_progress_callbacks):
+        try:
+            callback(stage)
+        except Exception as e:
+            print(f"⚠️ TTS progress callback failed: {e}")
+
+def add_progress_callback(callback):
+    """
+    Register a callable receiving startup stages: "loading_model",
+    "loading_voice", "warming_up", then "ready" or "failed".
+    """
+    _progress_callbacks.append(callback)
+
+def is_ready() -> bool:
+    """True once the Kokoro pipeline can synthesize speech."""
+    return _ready.is_set() and initialized
+
+def wait_ready(timeout=None) -> bool:
+    """Block (without spinning) until the pipeline is ready. Returns is_ready()."""
+    _ready.wait(timeout)
+    return is_ready()
 
 def initialize_pipeline():
-    global pipeline, initialized
+    global pipeline, initialized, initialization_error
     if not initialized:
-        print("🔄 Initializing TTS pipeline...")
-        pipeline = KPipeline(lang_code='a')
-        pipeline.load_voice('af_heart')
-        _ = list(pipeline("Warming up.", voice='af_heart'))
-        initialized = True
-        print("✅ TTS pipeline ready.")
+        try:
+            print("🔄 Initializing TTS pipeline...")
+            start = time.time()
+            _report_progress("loading_model")
+            # Imported here, on the loader thread: kokoro pulls in torch, which
+            # would otherwise hold up every `import core.tts` for seconds
+            from kokoro import KPipeline
+            pipeline = KPipeline(lang_code='a')
+            _report_progress("loading_voice")
+            pipeline.load_voice('af_heart')
+            _report_progress("warming_up")
+            _ = list(pipeline("Warming up.", voice='af_heart'))
+            initialized = True
+            print(f"✅ TTS pipeline ready in {time.time() - start:.2f} seconds.")
+            _report_progress("ready")
+        except Exception as e:
+            initialization_error = e
+            print(f"❌ TTS pipeline failed to initialize: {e}")
+            _report_progress("failed")
+        finally:
+            # Wake up waiters whether or not loading succeeded
+            _ready.set()
 
 # Start the TTS initialization in a separate thread
-def start_initialization():
+def start_initialization(progress_callback=None):
+    if progress_callback:
+        add_progress_callback(progress_callback)
     threading.Thread(target=initialize_pipeline, daemon=True).start()
 
 # Start initialization as soon as the script is loaded
 start_initialization()
 
-# Pre-recorded responses
-AUDIO_RESPONSES = {
-    "yes, sir?": "audio_responses/yes_sir.wav",
-    "how may i assist you, sir?": "audio_responses/how_may_i_assist.wav",
-    "anything else, sir?": "audio_responses/anything_else.wav",
-    "you're welcome, sir. i live to serve.": "audio_responses/youre_welcome.wav",
-    "goodbye, sir!": "audio_responses/goodbye.wav",
-}
+def _to_numpy(audio) -> np.ndarray:
+    """Kokoro yields torch tensors; the output stream wants float32 numpy."""
+    if hasattr(audio, "detach"):
+        audio = audio.detach().cpu().numpy()
+    return np.asarray(audio, dtype=np.float32).reshape(-1)
+
+
+class AudioPlayer:
+    """
+    One persistent output stream.
+
+    Chunks are written back to back, so consecutive pieces of speech play
+    without the gap that reopening the device with sd.play causes. Audio is
+    written in short blocks so interrupt() takes effect within one block
+    instead of after a whole synthesized chunk.
+    """
+
+    def __init__(self, samplerate=SAMPLE_RATE, block_s=0.05):
+        self.samplerate = samplerate
+        self.block_frames = max(1, int(samplerate * block_s))
+        self._stream = None
+        self._lock = threading.Lock()
+        self._interrupted = threading.Event()
+        # Wall-clock time at which everything written so far has been played
+        self._ends_at = 0.0
+
+    def _ensure_stream(self):
+        if self._stream is None:
+            # Imported here so importing core.tts does not need PortAudio
+            import sounddevice as sd
+
+            self._stream = sd.OutputStream(samplerate=self.samplerate, channels=1, dtype='float32')
+            self._stream.start()
+
+    def resume(self):
+        """Accept audio again after interrupt()."""
+        self._interrupted.clear()
+
+    def play(self, audio: np.ndarray) -> bool:
+        """
+        Queue audio on the device; blocks only while the device buffer is
+        full. Returns False if interrupted before all of it was written.
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32).reshape(-1, 1)
+        for start in range(0, len(audio), self.block_frames):
+            if self._interrupted.is_set():
+                return False
+            block = audio[start:start + self.block_frames]
+            with self._lock:
+                if self._interrupted.is_set():
+                    return False
+                self._ensure_stream()
+                self._stream.write(block)
+                self._ends_at = max(self._ends_at, time.time()) + len(block) / self.samplerate
+        return True
+
+    def wait(self):
+        """Return once the audio already written has left the speaker (or on interrupt())."""
+        stream = self._stream
+        if stream is None:
+            return
+        remaining = self._ends_at + stream.latency - time.time()
+        if remaining > 0:
+            self._interrupted.wait(remaining)
+
+    def interrupt(self):
+        """Drop whatever is still buffered on the device (barge-in)."""
+        # Set first: a writer checks it between blocks, so the lock below is
+        # held for at most one block
+        self._interrupted.set()
+        with self._lock:
+            if self._stream is not None:
+                self._stream.abort()
+                self._stream.close()
+                self._stream = None
+            self._ends_at = 0.0
+
+    def close(self):
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
 
-def speak(text: str, voice: str = 'af_heart'):
+
+class StreamingTTS:
+    """
+    Producer/consumer speech engine.
+
+    A synthesis thread runs the Kokoro generator and fills a bounded queue
+    while the calling thread plays chunks from it, so chunk N+1 is being
+    synthesized while chunk N is playing. Text can arrive as a stream of
+    sentences (e.g. from a streaming LLM); each sentence is looked up in the
+    pre-rendered store, cache and shipped clips, or synthesized, as soon as
+    it arrives.
+    """
+
+    def __init__(self, player: AudioPlayer, cache: TTSCache = None, prerendered: TTSCache = None,
+                 clips=None, max_chunks=4):
+        self.player = player
+        self.cache = cache
+        self.prerendered = prerendered
+        self.clips = {normalize_text(text): path for text, path in (clips or {}).items()}
+        self._clip_audio = {}
+        self.max_chunks = max_chunks
+        self.last_time_to_first_audio = None
+        self._stopped = threading.Event()
+
+    def _lookup(self, text, voice, speed):
+        for store in (self.prerendered, self.cache):
+            if store is not None:
+                audio = store.get(text, voice, speed)
+                if audio is not None:
+                    return audio
+        return self._clip(text, voice, speed)
+
+    def _clip(self, text, voice, speed):
+        path = self.clips.get(normalize_text(text))
+        if path is None or voice != CLIP_VOICE or speed != 1.0:
+            return None
+        if path not in self._clip_audio:
+            try:
+                audio, samplerate = sf.read(path, dtype="float32")
+            except Exception as e:
+                print(f"⚠️ Could not read {path}: {e}")
+                audio, samplerate = None, None
+            if audio is not None and audio.ndim > 1:
+                audio = audio.mean(axis=1)
+            # Only clips at the output rate can go on the shared stream
+            self._clip_audio[path] = audio if samplerate == self.player.samplerate else None
+        return self._clip_audio[path]
+
+    def _synthesize(self, text, voice, speed, chunks):
+        # Requests that arrive during startup wait here on an event, without
+        # burning a core while Kokoro loads
+        if not is_ready():
+            print("⏳ Waiting for TTS pipeline initialization...")
+            if not wait_ready(READY_TIMEOUT):
+                print(f"⚠️ TTS unavailable ({initialization_error or 'still loading'}), skipping audio.")
+                return
+
+        parts = []
+        for _, _, audio in pipeline(text, voice=voice, speed=speed):
+            if self._stopped.is_set():
+                return
+            if audio is not None:
+                parts.append(_to_numpy(audio))
+                chunks.put(parts[-1])
+
+        # Store the finished sentence once playback has everything it needs
+        if self.cache is not None and parts:
+            try:
+                self.cache.put(text, voice, speed, np.concatenate(parts))
+            except Exception as e:
+                print(f"⚠️ Could not cache TTS audio: {e}")
+
+    def _produce(self, segments, voice, speed, chunks):
+        try:
+            for text in segments:
+                if self._stopped.is_set():
+                    break
+                # Fixed phrases and phrases heard before play straight from
+                # disk, even while the pipeline is still loading
+                audio = self._lookup(text, voice, speed)
+                if audio is not None:
+                    chunks.put(audio)
+                else:
+                    self._synthesize(text, voice, speed, chunks)
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(None)
+
+    def speak_stream(self, segments, voice: str = 'af_heart', speed: float = 1.0):
+        """Speak an iterable of sentences, starting as soon as the first one is ready."""
+        start = time.time()
+        self._stopped.clear()
+        self.player.resume()
+        chunks = queue.Queue(maxsize=self.max_chunks)
+        threading.Thread(target=self._produce, args=(segments, voice, speed, chunks), daemon=True).start()
+
+        first = True
+        error = None
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                # Raised once the producer has put its end marker, so it never blocks on put()
+                error = chunk
+                continue
+            if self._stopped.is_set():
+                # Keep draining so the producer is never left blocked on put()
+                continue
+            if first:
+                self.last_time_to_first_audio = time.time() - start
+                print(f"[DEBUG] TTS time to first audio: {self.last_time_to_first_audio:.2f} seconds")
+                first = False
+            self.player.play(chunk)
+        if error is not None:
+            raise error
+        if not self._stopped.is_set():
+            self.player.wait()
+
+    def stop(self):
+        """Cut the current utterance short, e.g. when the user barges in."""
+        self._stopped.set()
+        self.player.interrupt()
+
+    def speak(self, text: str, voice: str = 'af_heart', speed: float = 1.0):
+        self.speak_stream([text], voice=voice, speed=speed)
+
+
+def load_prerendered(directory=PRERENDER_DIR):
+    """Load the pre-rendered phrase store if its manifest matches this Kokoro version."""
+    manifest_path = os.path.join(directory, "manifest.json")
+    if not os.path.isfile(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Could not read {manifest_path}: {e}")
+        return None
+    if manifest.get("model_version") != MODEL_VERSION:
+        print(f"⚠️ Pre-rendered phrases were made with {manifest.get('model_version')}, "
+              f"not {MODEL_VERSION}. Re-run assets/tts/prerender_phrases.py.")
+        return None
+    print(f"✅ Loaded {len(manifest.get('phrases', []))} pre-rendered phrases.")
+    return TTSCache(directory=directory, max_bytes=float("inf"))
+
+
+player = AudioPlayer()
+prerendered = load_prerendered()
+cache = TTSCache()
+engine = StreamingTTS(player, cache=cache, prerendered=prerendered, clips=CLIPS)
+
+
+def speak(text: str, voice: str = 'af_heart', speed: float = 1.0):
     print(f"Assistant: {text}")
     try:
-        key = text.strip().lower()
-        if key in AUDIO_RESPONSES:
-            filepath = AUDIO_RESPONSES[key]
-            if os.path.isfile(filepath):
-                audio, samplerate = sf.read(filepath)
-                sd.play(audio, samplerate=samplerate)
-                sd.wait()
-                return
-            else:
-                print(f"⚠️ Audio file not found: {filepath}")
+        engine.speak(text, voice=voice, speed=speed)
+    except Exception as e:
+        print(f"TTS error: {e}")
 
-        # Ensure the pipeline is initialized before use
-        if not initialized:
-            print("⏳ Waiting for TTS pipeline initialization...")
-            while not initialized:
-                pass  # Wait for the pipeline to initialize
 
-        # Fallback to TTS
-        generator = pipeline(text, voice=voice)
-        for _, _, audio in generator:
-            sd.play(audio, samplerate=24000)
-            sd.wait()
+def stop_speaking():
+    engine.stop()
+
 
+def speak_stream(segments, voice: str = 'af_heart', speed: float = 1.0) -> str:
+    """
+    Speak sentences as they are produced (e.g. by SentenceSegmenter over an
+    LLM token stream). Returns the full text that was spoken.
+    """
+    spoken = []
+
+    def _echo():
+        for sentence in segments:
+            print(f"Assistant: {sentence}")
+            spoken.append(sentence)
+            yield sentence
+
+    try:
+        engine.speak_stream(_echo(), voice=voice, speed=speed)
     except Exception as e:
         print(f"TTS error: {e}")
+    return " ".join(spoken)
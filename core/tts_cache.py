@@ -0,0 +1,135 @@
+# core/tts_cache.py
+
+import collections
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+CACHE_DIR = os.getenv("SARAH_TTS_CACHE_DIR", "audio_responses/cache")
+CACHE_MAX_MB = float(os.getenv("SARAH_TTS_CACHE_MB", "200"))
+
+
+def _kokoro_version() -> str:
+    try:
+        from importlib.metadata import version
+        return f"kokoro-{version('kokoro')}"
+    except Exception:
+        return "kokoro-unknown"
+
+
+MODEL_VERSION = _kokoro_version()
+
+
+def normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a phrase, used for cache keys."""
+    return " ".join(text.strip().lower().split())
+
+
+class TTSCache:
+    """
+    Content-addressed LRU cache of synthesized speech on disk.
+
+    Entries are keyed by a hash of (normalized text, voice, speed, model
+    version) and stored as 16-bit FLAC. File modification times record
+    recency, so the LRU order survives restarts; the oldest entries are
+    evicted once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=int(CACHE_MAX_MB * 1024 * 1024),
+                 model_version=MODEL_VERSION, samplerate=24000):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.model_version = model_version
+        self.samplerate = samplerate
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()  # key -> size, least recent first
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    def _load_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".flac"):
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total += size
+
+    def key(self, text: str, voice: str, speed: float = 1.0) -> str:
+        payload = json.dumps([normalize_text(text), voice, round(float(speed), 3), self.model_version])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.flac")
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, text: str, voice: str, speed: float = 1.0) -> Optional[np.ndarray]:
+        """Return cached float32 audio, or None on a miss."""
+        key = self.key(text, voice, speed)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        path = self._path(key)
+        try:
+            audio, _ = sf.read(path, dtype="float32")
+            os.utime(path)
+            return audio
+        except Exception as e:
+            print(f"⚠️ Dropping unreadable TTS cache entry {key}: {e}")
+            self._remove(key)
+            return None
+
+    def put(self, text: str, voice: str, speed: float, audio: np.ndarray) -> str:
+        """Store audio for a phrase and evict old entries if over the size cap."""
+        key = self.key(text, voice, speed)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        sf.write(tmp_path, np.asarray(audio, dtype=np.float32), self.samplerate,
+                 format="FLAC", subtype="PCM_16")
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self._total += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+        self._evict()
+        return key
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._total -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while True:
+            with self._lock:
+                if self._total <= self.max_bytes or len(self._entries) <= 1:
+                    return
+                key = next(iter(self._entries))
+            self._remove(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,142 @@
+# core/vad.py
+
+"""
+Frame-level voice activity detection and endpointing.
+
+Works on the 30 ms int16 frames of the shared microphone stream. The default
+detector combines frame energy (relative to the tracked noise floor) with the
+zero-crossing rate, which keeps quiet fricatives like the "s" in "search"
+inside the utterance. If the optional `webrtcvad` package is installed it can
+be selected with SARAH_VAD=webrtc.
+"""
+
+import collections
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+VAD_BACKEND = os.getenv("SARAH_VAD", "energy").lower()
+
+
+class FrameVAD:
+    """Interface: classify a single audio frame as speech or not."""
+
+    def is_speech(self, frame: bytes) -> bool:
+        raise NotImplementedError
+
+
+class EnergyZcrVAD(FrameVAD):
+    """Energy + zero-crossing-rate detector with a dynamic threshold."""
+
+    def __init__(self, threshold_fn: Callable[[], float], weak_ratio=0.6, min_zcr=0.3):
+        self.threshold_fn = threshold_fn
+        self.weak_ratio = weak_ratio
+        self.min_zcr = min_zcr
+
+    def is_speech(self, frame: bytes) -> bool:
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        threshold = self.threshold_fn()
+        if rms >= threshold:
+            return True
+        if rms < threshold * self.weak_ratio:
+            return False
+        # Weak but noisy-sounding frames are usually unvoiced consonants
+        zcr = float(np.mean(np.signbit(samples[1:]) != np.signbit(samples[:-1])))
+        return zcr >= self.min_zcr
+
+
+class WebRtcVAD(FrameVAD):
+    """Wrapper around the optional webrtcvad package."""
+
+    def __init__(self, sample_rate=16000, aggressiveness=2):
+        import webrtcvad
+
+        self.sample_rate = sample_rate
+        self.vad = webrtcvad.Vad(aggressiveness)
+
+    def is_speech(self, frame: bytes) -> bool:
+        return self.vad.is_speech(frame, self.sample_rate)
+
+
+def create_vad(threshold_fn: Callable[[], float], backend: Optional[str] = None) -> FrameVAD:
+    """Build the configured VAD, falling back to energy + ZCR."""
+    backend = backend or VAD_BACKEND
+    if backend == "webrtc":
+        try:
+            return WebRtcVAD()
+        except ImportError:
+            print("⚠️ webrtcvad is not installed, using the energy VAD instead.")
+    return EnergyZcrVAD(threshold_fn)
+
+
+class Endpointer:
+    """
+    Turns per-frame VAD decisions into utterance boundaries.
+
+    Speech starts after `onset_frames` consecutive speech frames and ends
+    after `end_silence_s` without speech (or at `max_utterance_s`). The
+    returned audio keeps a short pre-roll and tail and drops the rest of the
+    leading and trailing silence.
+    """
+
+    def __init__(self, vad: FrameVAD, frame_ms=30, onset_frames=3, end_silence_s=0.5,
+                 pre_roll_s=0.2, tail_s=0.1, max_utterance_s=15.0):
+        self.vad = vad
+        self.frame_s = frame_ms / 1000.0
+        self.onset_frames = onset_frames
+        self.end_silence_frames = round(end_silence_s / self.frame_s)
+        self.tail_frames = round(tail_s / self.frame_s)
+        self.max_frames = round(max_utterance_s / self.frame_s)
+        self._pre_roll = collections.deque(maxlen=round(pre_roll_s / self.frame_s) + onset_frames)
+        self.reset()
+
+    def reset(self):
+        self._pre_roll.clear()
+        self.frames = []
+        self.in_speech = False
+        self.ended = False
+        self._run = 0
+        self._silence = 0
+        self._last_speech = 0
+
+    def process(self, frame: bytes) -> Optional[str]:
+        """
+        Feed one frame. Returns "start" when speech begins, "end" when the
+        utterance is complete, otherwise None.
+        """
+        speech = self.vad.is_speech(frame)
+        if not self.in_speech:
+            self._pre_roll.append(frame)
+            self._run = self._run + 1 if speech else 0
+            if self._run >= self.onset_frames:
+                self.in_speech = True
+                self.frames = list(self._pre_roll)
+                self._last_speech = len(self.frames)
+                return "start"
+            return None
+
+        self.frames.append(frame)
+        if speech:
+            self._silence = 0
+            self._last_speech = len(self.frames)
+        else:
+            self._silence += 1
+        if self._silence >= self.end_silence_frames or len(self.frames) >= self.max_frames:
+            self.ended = True
+            return "end"
+        return None
+
+    @property
+    def trailing_silence(self) -> float:
+        """Seconds without speech since the last speech frame of the utterance."""
+        return self._silence * self.frame_s
+
+    @property
+    def speech_duration(self) -> float:
+        return len(self.frames) * self.frame_s
+
+    def utterance(self) -> bytes:
+        """Audio of the current utterance with trailing silence trimmed."""
+        return b"".join(self.frames[:self._last_speech + self.tail_frames])
@@ -1,50 +1,380 @@
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
 import speech_recognition as sr
 
-def listen(timeout=5, phrase_time_limit=7):
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        # print("Adjusting for ambient noise, please wait...")
-        recognizer.adjust_for_ambient_noise(source, duration=1)
-        print("Listening... Please speak clearly.")
+from core.audio_stream import get_microphone_stream, get_noise_floor, SAMPLE_RATE
+from core.vad import Endpointer, create_vad
+
+# Speech-to-text engine: "google" (online) or "whisper" (local faster-whisper)
+STT_BACKEND = os.getenv("SARAH_STT_BACKEND", "google").lower()
+WHISPER_MODEL = os.getenv("SARAH_WHISPER_MODEL", "base")
+WHISPER_DEVICE = os.getenv("SARAH_WHISPER_DEVICE", "cpu")
+WHISPER_COMPUTE_TYPE = os.getenv("SARAH_WHISPER_COMPUTE_TYPE", "int8")
+
+# Seconds of new speech between two partial hypotheses in streaming mode
+PARTIAL_INTERVAL = 0.6
+# A pause this long after the last word means the word was complete when the
+# partial was decoded ("open fire" will not still turn into "open firefox")
+STABLE_PAUSE_S = 0.15
+# Longest single command; the VAD normally ends the utterance much sooner
+MAX_UTTERANCE_S = 15
+# Talking over a reply interrupts it. Off by default: without echo
+# cancellation the assistant's own voice can trigger it on open speakers
+BARGE_IN = os.getenv("SARAH_BARGE_IN", "0") == "1"
+# Barge-in needs speech this many times above the normal energy threshold
+BARGE_IN_RATIO = float(os.getenv("SARAH_BARGE_IN_RATIO", "3.0"))
+
+# Stream index where a barge-in started, so the next listen keeps those words
+_resume_index = None
+
+
+class STTBackend:
+    """Base class for speech-to-text engines working on in-memory audio."""
+
+    name = "base"
+    # Whether partial hypotheses are cheap enough to compute while the user speaks
+    supports_partials = False
+
+    def __init__(self):
+        self.last_latency: Optional[float] = None
+
+    def warm_up(self):
+        """Load models or open connections ahead of the first request."""
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Optional[str]:
+        """
+        Transcribe mono int16 audio.
+
+        Returns:
+            str: Lowercase transcript, or None if nothing was understood
+        """
+        start = time.time()
         try:
-            audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
-        except sr.WaitTimeoutError:
-            print("Listening timed out while waiting for phrase to start.")
+            text = self._transcribe(samples, sample_rate)
+        finally:
+            self.last_latency = time.time() - start
+            print(f"[DEBUG] STT ({self.name}) took {self.last_latency:.2f} seconds")
+        return self._clean(text)
+
+    def transcribe_partial(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Optional[str]:
+        """Transcribe an utterance that is still in progress."""
+        return self._clean(self._transcribe(samples, sample_rate))
+
+    @staticmethod
+    def _clean(text: Optional[str]) -> Optional[str]:
+        if not text:
             return None
+        text = text.strip().strip(".!?").strip().lower()
+        return text or None
 
-    try:
-        text = recognizer.recognize_google(audio)
-        text = text.strip().lower()
-        print(f"You said: {text}")
-        return text
-    except sr.UnknownValueError:
-        print("Sorry, I couldn't understand what you said.")
-        return None
-    except sr.RequestError as e:
-        print(f"Could not request results; {e}")
-        return None
+    def _transcribe(self, samples: np.ndarray, sample_rate: int) -> Optional[str]:
+        raise NotImplementedError
+
+
+class GoogleSTT(STTBackend):
+    """Google Speech Recognition through the speech_recognition package."""
+
+    name = "google"
 
-def listen_with_timeout(user_timeout=15):
-    """Listen for user input with a specified timeout. Returns None if timeout occurs."""
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        recognizer.adjust_for_ambient_noise(source, duration=1)
-        print("Listening... Please speak clearly.")
+    def __init__(self):
+        super().__init__()
+        self.recognizer = sr.Recognizer()
+
+    def _transcribe(self, samples, sample_rate):
+        audio = sr.AudioData(samples.astype(np.int16).tobytes(), sample_rate, 2)
         try:
-            # Use the user-specified timeout
-            audio = recognizer.listen(source, timeout=user_timeout, phrase_time_limit=7)
-        except sr.WaitTimeoutError:
+            return self.recognizer.recognize_google(audio)
+        except sr.UnknownValueError:
+            print("Sorry, I couldn't understand what you said.")
+            return None
+        except sr.RequestError as e:
+            print(f"Could not request results; {e}")
+            return None
+
+
+class FasterWhisperSTT(STTBackend):
+    """
+    Local faster-whisper transcription.
+
+    The model is loaded once and stays resident; audio is passed as a numpy
+    array, so no temporary WAV files are written.
+    """
+
+    name = "whisper"
+    supports_partials = True
+
+    def __init__(self, model_size=WHISPER_MODEL, device=WHISPER_DEVICE,
+                 compute_type=WHISPER_COMPUTE_TYPE, language="en", beam_size=1):
+        super().__init__()
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.language = language
+        self.beam_size = beam_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        with self._lock:
+            if self._model is None:
+                from faster_whisper import WhisperModel
+
+                print(f"🔄 Loading faster-whisper '{self.model_size}' ({self.device}, {self.compute_type})...")
+                start = time.time()
+                self._model = WhisperModel(self.model_size, device=self.device, compute_type=self.compute_type)
+                print(f"✅ faster-whisper ready in {time.time() - start:.2f} seconds.")
+            return self._model
+
+    def warm_up(self):
+        # One pass over silence initializes the decoder as well as the weights
+        segments, _ = self.model.transcribe(np.zeros(SAMPLE_RATE // 2, dtype=np.float32),
+                                            language=self.language, beam_size=1)
+        list(segments)
+
+    def _transcribe(self, samples, sample_rate):
+        audio = samples.astype(np.float32)
+        if samples.dtype == np.int16:
+            audio /= 32768.0
+        if sample_rate != SAMPLE_RATE:
+            target = np.arange(0, len(audio), sample_rate / SAMPLE_RATE)
+            audio = np.interp(target, np.arange(len(audio)), audio).astype(np.float32)
+
+        segments, _ = self.model.transcribe(audio, language=self.language, beam_size=self.beam_size)
+        return " ".join(segment.text.strip() for segment in segments)
+
+
+STT_BACKENDS = {
+    "google": GoogleSTT,
+    "whisper": FasterWhisperSTT,
+}
+
+_stt_backend = None
+_stt_lock = threading.Lock()
+
+
+def get_stt_backend() -> STTBackend:
+    """Return the shared STT backend selected by SARAH_STT_BACKEND."""
+    global _stt_backend
+    with _stt_lock:
+        if _stt_backend is None:
+            if STT_BACKEND not in STT_BACKENDS:
+                raise ValueError(f"Unknown STT backend '{STT_BACKEND}', expected one of {sorted(STT_BACKENDS)}")
+            _stt_backend = STT_BACKENDS[STT_BACKEND]()
+        return _stt_backend
+
+
+def start_warm_up():
+    """Warm up the STT backend in the background so the first command is fast."""
+    threading.Thread(target=get_stt_backend().warm_up, daemon=True).start()
+
+
+def _samples(audio: bytes) -> np.ndarray:
+    return np.frombuffer(audio, dtype=np.int16)
+
+
+class PartialDecoder:
+    """
+    Transcribes snapshots of an utterance in progress on a worker thread.
+
+    The frame-reading loop hands over a copy of the audio so far and goes
+    straight back to endpointing; a snapshot submitted while the previous one
+    is still being decoded is dropped, so partials never queue up behind a
+    slow backend. `match` is set by the first partial that `early_match`
+    turns into a command and whose last word is stable: it was followed by a
+    pause, or the previous partial ended in the same word.
+    """
+
+    def __init__(self, backend: STTBackend, early_match: Optional[Callable] = None,
+                 on_partial: Optional[Callable] = None, stable_pause_s=STABLE_PAUSE_S):
+        self.backend = backend
+        self.early_match = early_match
+        self.on_partial = on_partial
+        self.stable_pause_s = stable_pause_s
+        self.match: Optional[str] = None
+        self._snapshot = None
+        self._busy = False
+        self._closed = False
+        self._last_word = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, audio: bytes, trailing_silence: float) -> bool:
+        """Queue a snapshot for decoding; False if the worker is still busy."""
+        with self._cond:
+            if self._busy or self._snapshot is not None or self._closed:
+                return False
+            self._snapshot = (audio, trailing_silence)
+            self._cond.notify()
+            return True
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._snapshot is not None or self._closed)
+                if self._closed:
+                    return
+                (audio, trailing_silence), self._snapshot = self._snapshot, None
+                self._busy = True
+            try:
+                partial = self.backend.transcribe_partial(_samples(audio))
+            except Exception as e:
+                print(f"[DEBUG] Partial transcription failed: {e}")
+                partial = None
+            with self._cond:
+                self._busy = False
+                if self._closed or not partial:
+                    continue
+            self._accept(partial, trailing_silence)
+
+    def _accept(self, partial: str, trailing_silence: float):
+        if self.on_partial:
+            self.on_partial(partial)
+        last_word = partial.split()[-1]
+        stable = trailing_silence >= self.stable_pause_s or last_word == self._last_word
+        self._last_word = last_word
+        match = self.early_match(partial) if self.early_match else None
+        if match and stable and self.match is None:
+            print(f"[DEBUG] Early dispatch on partial: '{match}' ({trailing_silence:.2f}s pause)")
+            self.match = match
+
+
+def listen_streaming(user_timeout=15, phrase_time_limit=MAX_UTTERANCE_S,
+                     early_match: Optional[Callable] = None,
+                     on_partial: Optional[Callable] = None):
+    """
+    Capture one utterance from the shared stream and transcribe it.
+    
+    A frame-level VAD decides where speech starts and ends, so the utterance
+    ends as soon as the user stops talking and only the trimmed speech is
+    sent to the STT backend. Backends that support partial transcripts get
+    the growing utterance every PARTIAL_INTERVAL seconds and as soon as the
+    user pauses, decoded by a PartialDecoder off the frame-reading loop.
+    
+    Args:
+        user_timeout: Seconds to wait for speech to start
+        phrase_time_limit: Maximum utterance length in seconds
+        early_match: Callable returning a command string when a partial
+            transcript is already actionable; dispatched on the first such
+            partial whose last word is stable
+        on_partial: Optional callable receiving every partial transcript,
+            called from the decoder thread
+    
+    Returns:
+        str: Transcript (or early-matched command), None if not understood,
+             "TIMEOUT" if no speech started in time
+    """
+    backend = get_stt_backend()
+    stream = get_microphone_stream()
+    noise_floor = get_noise_floor()
+    noise_floor.wait_calibrated(timeout=2.0)
+    endpointer = Endpointer(create_vad(lambda: noise_floor.energy_threshold),
+                            frame_ms=stream.frame_ms, max_utterance_s=phrase_time_limit)
+    reader = stream.reader()
+    frame_s = stream.frame_ms / 1000.0
+
+    global _resume_index
+    if _resume_index is not None:
+        reader.index, _resume_index = _resume_index, None
+
+    # Wait for speech onset
+    waited = 0.0
+    while endpointer.process(reader.read()) != "start":
+        waited += frame_s
+        if user_timeout and waited > user_timeout:
             print(f"Listening timed out after {user_timeout} seconds.")
             return "TIMEOUT"
 
+    decoder = None
+    if backend.supports_partials and (early_match or on_partial):
+        decoder = PartialDecoder(backend, early_match, on_partial)
     try:
-        text = recognizer.recognize_google(audio)
-        text = text.strip().lower()
+        since_partial = 0.0
+        paused = pause_pending = False
+        while endpointer.process(reader.read()) != "end":
+            if decoder is None:
+                continue
+            if decoder.match:
+                return decoder.match
+            since_partial += frame_s
+            # Also decode as soon as the user pauses: short commands are
+            # often over before PARTIAL_INTERVAL has passed
+            silent = endpointer.trailing_silence >= STABLE_PAUSE_S
+            pause_pending = pause_pending or (silent and not paused)
+            paused = silent
+            if since_partial >= PARTIAL_INTERVAL or pause_pending:
+                if decoder.submit(endpointer.utterance(), endpointer.trailing_silence):
+                    since_partial = 0.0
+                    pause_pending = False
+        if decoder is not None and decoder.match:
+            return decoder.match
+    finally:
+        if decoder is not None:
+            decoder.close()
+
+    audio = endpointer.utterance()
+    print(f"[DEBUG] Utterance: {len(audio) / (2 * stream.sample_rate):.2f}s sent to STT "
+          f"(captured {endpointer.speech_duration:.2f}s)")
+    text = backend.transcribe(_samples(audio))
+    if text:
         print(f"You said: {text}")
-        return text
-    except sr.UnknownValueError:
-        print("Sorry, I couldn't understand what you said.")
-        return None
-    except sr.RequestError as e:
-        print(f"Could not request results; {e}")
+    return text
+
+
+def watch_for_barge_in(on_barge_in: Callable[[], None], stop_event: threading.Event,
+                       ratio=BARGE_IN_RATIO, onset_s=0.3) -> threading.Thread:
+    """
+    Watch the microphone while the assistant is speaking and call
+    `on_barge_in()` once if the user starts talking before `stop_event` is set.
+    """
+    def _watch():
+        global _resume_index
+        stream = get_microphone_stream()
+        noise_floor = get_noise_floor()
+        frame_s = stream.frame_ms / 1000.0
+        # Energy VAD regardless of SARAH_VAD: only a raised threshold keeps
+        # the speaker output from counting as speech
+        endpointer = Endpointer(create_vad(lambda: noise_floor.energy_threshold * ratio, backend="energy"),
+                                frame_ms=stream.frame_ms, onset_frames=max(1, round(onset_s / frame_s)))
+        reader = stream.reader()
+        while not stop_event.is_set():
+            frame = reader.read(timeout=0.1)
+            if frame is None:
+                continue
+            if endpointer.process(frame) == "start":
+                print("[DEBUG] Barge-in detected")
+                _resume_index = reader.index - len(endpointer.frames)
+                on_barge_in()
+                return
+
+    thread = threading.Thread(target=_watch, daemon=True)
+    thread.start()
+    return thread
+
+
+def listen(timeout=5, phrase_time_limit=MAX_UTTERANCE_S):
+    print("Listening... Please speak clearly.")
+    text = listen_streaming(user_timeout=timeout, phrase_time_limit=phrase_time_limit)
+    if text == "TIMEOUT":
         return None
+    return text
+
+def listen_with_timeout(user_timeout=15, early_match=None):
+    """
+    Listen for user input with a specified timeout. Returns "TIMEOUT" if timeout occurs.
+    
+    With a backend that supports partial transcripts, `early_match` lets the
+    caller act on a command before the user has finished speaking.
+    """
+    print("Listening... Please speak clearly.")
+    return listen_streaming(user_timeout=user_timeout, early_match=early_match)
@@ -1,33 +1,48 @@
 # core/wake_word_listener.py
 
+import os
+
 import speech_recognition as sr
 
+from core.audio_stream import current_energy_threshold, get_microphone_stream, get_noise_floor, open_source
+from core.keyword_spotter import load_default_spotter
+
+# "local" spots the wake word offline on streaming frames; "google" sends
+# every phrase to Google Speech Recognition (the original behaviour)
+WAKE_WORD_BACKEND = os.getenv("SARAH_WAKE_BACKEND", "local").lower()
+
 # All acceptable transcriptions of the name "Sarah"
 SARAH_WAKE_WORDS = {
     "sarah", "sara", "sarra", "sarah", "sahra", "sahara", "sari", "sarae"
 }
 
-def listen_for_wake_word(callback_func=None):
+def listen_for_wake_word(callback_func=None, recognizer=None, source=None):
     """
     Listen for wake word using speech recognition.
     
     Args:
         callback_func: Function to call when wake word is detected
+        recognizer: Optional calibrated sr.Recognizer to reuse
+        source: Optional RingBufferSource to reuse (keeps the mic open)
     
     Returns:
         str: Detected wake word or None if error
     """
-    recognizer = sr.Recognizer()
-    mic = sr.Microphone()
-    
     try:
-        with mic as source:
-            recognizer.adjust_for_ambient_noise(source)
+        if recognizer is None:
+            recognizer = sr.Recognizer()
+            recognizer.dynamic_energy_threshold = False
+        if source is None:
+            source = open_source()
         
         while True:
             try:
-                with mic as source:
-                    # Listen with timeout
+                # Follow the background noise floor instead of recalibrating
+                recognizer.energy_threshold = current_energy_threshold()
+                
+                # The shared stream keeps buffering while we transcribe,
+                # so nothing said between phrases is lost
+                with source:
                     audio = recognizer.listen(
                         source, 
                         timeout=None, 
@@ -62,22 +77,75 @@ def listen_for_wake_word(callback_func=None):
         return None
     except Exception as e:
         return None
-def listen_continuously(wake_word_callback):
+def listen_for_wake_word_local(spotter, reader, callback_func=None):
     """
-    Continuously listen for wake word using speech recognition.
+    Listen for wake word with the offline keyword spotter.
+    
+    Args:
+        spotter: WakeWordBackend fed with one stream frame at a time
+        reader: StreamReader over the shared microphone stream
+        callback_func: Function to call when wake word is detected
+    
+    Returns:
+        str: Detected wake word
+    """
+    noise_floor = get_noise_floor()
+    while True:
+        # Keep the spotter's energy gate in step with the room noise
+        spotter.min_rms = noise_floor.energy_threshold
+        detected_word = spotter.process(reader.read())
+        if detected_word:
+            if callback_func:
+                callback_func(detected_word)
+            return detected_word
+
+def listen_continuously(wake_word_callback, backend=None):
+    """
+    Continuously listen for wake word.
+    
+    The recognizer and the microphone stream are created once and reused
+    for every wake word cycle.
     
     Args:
         wake_word_callback: Function to call when wake word is detected
+        backend: "local" or "google"; defaults to SARAH_WAKE_BACKEND
     """
+    backend = (backend or WAKE_WORD_BACKEND).lower()
     try:
+        if backend == "local":
+            spotter = load_default_spotter()
+            if spotter is None:
+                print("⚠️ No wake word templates found in assets/wake_word, "
+                      "falling back to speech recognition. "
+                      "Run `python -m core.keyword_spotter` to enroll.")
+                backend = "google"
+        
+        if backend == "local":
+            print("🔒 Using offline wake word detection.")
+            reader = get_microphone_stream().reader()
+            while True:
+                listen_for_wake_word_local(spotter, reader, callback_func=wake_word_callback)
+                # Skip the audio captured during the conversation so it is
+                # not replayed into the detector
+                reader.seek_latest()
+                spotter.reset()
+        
+        recognizer = sr.Recognizer()
+        recognizer.dynamic_energy_threshold = False
+        source = open_source()
+        
         while True:
-            detected = listen_for_wake_word(callback_func=wake_word_callback)
+            detected = listen_for_wake_word(
+                callback_func=wake_word_callback,
+                recognizer=recognizer,
+                source=source
+            )
             if detected:
-                # Continue listening for next wake word
-                pass
+                # Skip the audio captured during the conversation so it is
+                # not replayed into the detector
+                source.reader.seek_latest()
     except KeyboardInterrupt:
         pass
     except Exception as e:
         pass
 
-# Remove the unnecessary CustomWakeWordDetector class since we only use speech recognition
\ No newline at end of file
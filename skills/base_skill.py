@@ -0,0 +1,81 @@
+# skills/base_skill.py
+
+"""
+Declarative skill registry.
+
+A Skill names its trigger phrases and the function that handles it as a
+"module:function" string. Declaring a skill is free; the module (and
+whatever heavy libraries it pulls in, e.g. browser_use for the browser
+skill) is imported the first time the skill is dispatched.
+"""
+
+import importlib
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class Skill:
+    """A routable skill: trigger phrases, routing weight and a lazily imported handler."""
+
+    def __init__(self, name: str, triggers: List[str], handler: str, weight=1.0, description=""):
+        if ":" not in handler:
+            raise ValueError(f"Skill '{name}': handler must look like 'package.module:function'")
+        self.name = name
+        self.triggers = list(triggers)
+        self.handler = handler
+        self.weight = weight
+        self.description = description
+        self._function: Optional[Callable] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._function is not None
+
+    def load(self) -> Callable:
+        """Import the handler's module on first use and return the handler."""
+        if self._function is None:
+            with self._lock:
+                if self._function is None:
+                    module_name, function_name = self.handler.split(":")
+                    start = time.time()
+                    module = importlib.import_module(module_name)
+                    self._function = getattr(module, function_name)
+                    print(f"[DEBUG] Loaded skill '{self.name}' ({module_name}) "
+                          f"in {time.time() - start:.2f} seconds")
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+class SkillRegistry:
+    """Skills by name, in registration order."""
+
+    def __init__(self):
+        self._skills: Dict[str, Skill] = {}
+
+    def register(self, skill: Skill) -> Skill:
+        if skill.name in self._skills:
+            raise ValueError(f"Skill '{skill.name}' is already registered")
+        self._skills[skill.name] = skill
+        return skill
+
+    def get(self, name: str) -> Skill:
+        return self._skills[name]
+
+    def __iter__(self):
+        return iter(self._skills.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._skills
+
+    def preload(self, names=None):
+        """Import skill modules now (e.g. in a background thread after startup)."""
+        for skill in self:
+            if names is None or skill.name in names:
+                try:
+                    skill.load()
+                except Exception as e:
+                    print(f"⚠️ Could not load skill '{skill.name}': {e}")
@@ -0,0 +1,212 @@
+# skills/system/app_discovery.py
+
+"""
+Builds assets/apps/apps.json from the applications installed on this machine.
+
+Backends find launcher files and resolve each one to (app name, target):
+- Windows: Start Menu .lnk shortcuts, resolved through WScript.Shell
+- Linux: freedesktop .desktop entries (Name= / Exec=)
+
+Scans are incremental: every launcher file's mtime and resolved entry are
+kept in a cache file next to apps.json, and only new or changed files are
+resolved again, in parallel. Run assets/apps/find_exe_start_menu.py.
+"""
+
+import concurrent.futures
+import json
+import os
+import shlex
+import shutil
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+APPS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "assets", "apps")
+CACHE_VERSION = 1
+
+
+class LauncherBackend:
+    """Finds launcher files and resolves one to (app name, target), or None to skip it."""
+
+    name = "base"
+    suffix = ""
+
+    def roots(self) -> List[str]:
+        raise NotImplementedError
+
+    def init_worker(self):
+        """Per-thread setup before the first resolve() on a worker thread."""
+
+    def resolve(self, path: str) -> Optional[Tuple[str, str]]:
+        raise NotImplementedError
+
+    def scan(self) -> Iterator[Tuple[str, int]]:
+        """(path, mtime_ns) of every launcher file, earlier roots first."""
+        for base in self.roots():
+            for root, dirs, files in os.walk(base):
+                dirs.sort()
+                for file in sorted(files):
+                    if file.lower().endswith(self.suffix):
+                        path = os.path.join(root, file)
+                        try:
+                            yield path, os.stat(path).st_mtime_ns
+                        except OSError:
+                            continue
+
+
+class StartMenuBackend(LauncherBackend):
+    """Current user's Start Menu shortcuts (needs pywin32)."""
+
+    name = "start_menu"
+    suffix = ".lnk"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def roots(self) -> List[str]:
+        # ✅ Only use the current user's Start Menu path
+        appdata = os.environ.get("APPDATA")
+        return [os.path.join(appdata, "Microsoft", "Windows", "Start Menu", "Programs")] if appdata else []
+
+    def init_worker(self):
+        # COM is per thread; one WScript.Shell per worker instead of one per shortcut
+        import pythoncom
+        import win32com.client
+
+        pythoncom.CoInitialize()
+        self._local.shell = win32com.client.Dispatch("WScript.Shell")
+
+    def resolve(self, path: str) -> Optional[Tuple[str, str]]:
+        target = self._local.shell.CreateShortCut(path).Targetpath
+        if target and os.path.isfile(target):
+            return os.path.splitext(os.path.basename(path))[0].lower(), target
+        return None
+
+
+class DesktopEntryBackend(LauncherBackend):
+    """freedesktop.org .desktop entries from the XDG application directories."""
+
+    name = "desktop"
+    suffix = ".desktop"
+
+    def __init__(self, directories: Optional[List[str]] = None):
+        self.directories = directories
+
+    def roots(self) -> List[str]:
+        if self.directories is not None:
+            return self.directories
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+        data_dirs.append("/var/lib/flatpak/exports/share")
+        # User entries come first so they override system ones of the same name
+        return [os.path.join(d, "applications") for d in [data_home] + data_dirs if d]
+
+    @staticmethod
+    def _entry(path: str) -> Dict[str, str]:
+        fields, in_entry = {}, False
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line and not line.startswith("#"):
+                    key, value = line.split("=", 1)
+                    fields.setdefault(key.strip(), value.strip())
+        return fields
+
+    def resolve(self, path: str) -> Optional[Tuple[str, str]]:
+        entry = self._entry(path)
+        if (entry.get("Type") != "Application" or entry.get("NoDisplay") == "true"
+                or entry.get("Hidden") == "true" or not entry.get("Name") or not entry.get("Exec")):
+            return None
+        # Drop field codes (%U, %f, ...) the launcher would fill in
+        argv = [arg for arg in shlex.split(entry["Exec"]) if not (len(arg) == 2 and arg[0] == "%")]
+        if not argv:
+            return None
+        executable = shutil.which(argv[0])
+        if executable is None:
+            return None
+        argv[0] = executable
+        return entry["Name"].lower(), argv[0] if len(argv) == 1 else shlex.join(argv)
+
+
+def default_backend() -> LauncherBackend:
+    return StartMenuBackend() if sys.platform == "win32" else DesktopEntryBackend()
+
+
+class AppDiscovery:
+    """Incremental, parallel scan of one backend into an app name -> target mapping."""
+
+    def __init__(self, backend: LauncherBackend = None, cache_path: Optional[str] = None, workers=8):
+        self.backend = backend or default_backend()
+        self.cache_path = cache_path or os.path.join(APPS_DIR, f".{self.backend.name}_cache.json")
+        self.workers = workers
+        self.last_stats: Dict[str, float] = {}
+
+    def _load_cache(self) -> Dict[str, dict]:
+        try:
+            with open(self.cache_path, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache.get("entries", {}) if cache.get("version") == CACHE_VERSION else {}
+
+    def _save_cache(self, entries: Dict[str, dict]):
+        _write_json(self.cache_path, {"version": CACHE_VERSION, "entries": entries})
+
+    def _resolve(self, path: str):
+        local = self._worker_state
+        if not getattr(local, "ready", False):
+            self.backend.init_worker()
+            local.ready = True
+        try:
+            return self.backend.resolve(path)
+        except Exception as e:
+            print(f"Failed to resolve {path}: {e}")
+            return None
+
+    def scan(self) -> Dict[str, str]:
+        """Return the current mapping, re-resolving only launcher files that changed."""
+        start = time.time()
+        cached = self._load_cache()
+        found = list(self.backend.scan())
+        entries = {path: cached[path] for path, mtime in found
+                   if path in cached and cached[path]["mtime"] == mtime}
+        changed = [(path, mtime) for path, mtime in found if path not in entries]
+
+        if changed:
+            self._worker_state = threading.local()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = pool.map(self._resolve, [path for path, _ in changed])
+                for (path, mtime), result in zip(changed, results):
+                    name, target = result if result else (None, None)
+                    # Unresolvable files are cached too, so they are not retried until they change
+                    entries[path] = {"mtime": mtime, "name": name, "target": target}
+        self._save_cache(entries)
+
+        app_map = {}
+        for path, _ in found:
+            entry = entries[path]
+            if entry["name"] and entry["name"] not in app_map:
+                app_map[entry["name"]] = entry["target"]
+        self.last_stats = {"files": len(found), "resolved": len(changed),
+                           "removed": len(set(cached) - set(entries)), "seconds": time.time() - start}
+        print(f"🔎 {len(app_map)} apps from {len(found)} {self.backend.suffix} files "
+              f"({len(changed)} resolved, {len(found) - len(changed)} unchanged) "
+              f"in {self.last_stats['seconds']:.2f} seconds")
+        return app_map
+
+
+def _write_json(path: str, data, **kwargs):
+    # Write then rename, so a reader (the running assistant) never sees half a file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp_path, path)
+
+
+def save_app_mapping(app_map: Dict[str, str], filename=os.path.join(APPS_DIR, "apps.json")):
+    _write_json(filename, dict(sorted(app_map.items())), indent=4)
+    print(f"✅ Saved {len(app_map)} apps to {filename}")
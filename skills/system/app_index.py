@@ -0,0 +1,124 @@
+# skills/system/app_index.py
+
+"""
+In-memory index of assets/apps/apps.json.
+
+The file is parsed once and re-read only when its mtime or size changes,
+so "open X" commands no longer open and parse the JSON on every lookup.
+App names are also indexed by their normalized tokens: finding the app
+named anywhere in a command is a dictionary lookup per command word
+instead of a scan over every word n-gram.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+APPS_JSON = 'assets/apps/apps.json'
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_tokens(name: str) -> Tuple[str, ...]:
+    """Lowercase alphanumeric tokens: "Firefox Private-Browsing" -> ("firefox", "private", "browsing")."""
+    return tuple(_TOKEN.findall(name.lower()))
+
+
+class AppIndex:
+    """App name -> executable path, kept in sync with the JSON file."""
+
+    def __init__(self, filepath=APPS_JSON):
+        self.filepath = filepath
+        # Bumped on every reload so derived structures (e.g. fuzzy matchers) know to rebuild
+        self.version = 0
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._apps: Dict[str, str] = {}
+        self._by_tokens: Dict[Tuple[str, ...], str] = {}
+        # First token -> token tuples of app names starting with it, longest first
+        self._by_first: Dict[str, List[Tuple[str, ...]]] = {}
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, stamp):
+        apps = {}
+        if stamp is None:
+            print(f"⚠️ Could not find app mappings file: {self.filepath}")
+        else:
+            try:
+                with open(self.filepath, 'r') as f:
+                    apps = {name.lower(): path for name, path in json.load(f).items()}
+            except (OSError, json.JSONDecodeError, AttributeError):
+                print(f"⚠️ Error reading JSON file: {self.filepath}")
+
+        by_tokens = {}
+        # Exact keys first, so "notepad" beats "notepad++" for the tokens ("notepad",)
+        for name in sorted(apps, key=lambda n: " ".join(normalize_tokens(n)) != n):
+            tokens = normalize_tokens(name)
+            if tokens:
+                by_tokens.setdefault(tokens, name)
+        by_first = {}
+        for tokens in sorted(by_tokens, key=len, reverse=True):
+            by_first.setdefault(tokens[0], []).append(tokens)
+
+        self._apps, self._by_tokens, self._by_first = apps, by_tokens, by_first
+        self._stamp = stamp
+        self.version += 1
+
+    def refresh(self):
+        """Reload the file if it changed since it was last read (one stat call otherwise)."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp or self.version == 0:
+            with self._lock:
+                if stamp != self._stamp or self.version == 0:
+                    self._load(stamp)
+
+    def mappings(self) -> Dict[str, str]:
+        """Current app name -> path mapping. Treat as read-only."""
+        self.refresh()
+        return self._apps
+
+    def resolve(self, name: str) -> Optional[str]:
+        """The mapping key for an app name, ignoring case and punctuation; None if unknown."""
+        self.refresh()
+        name = name.lower().strip()
+        if name in self._apps:
+            return name
+        return self._by_tokens.get(normalize_tokens(name))
+
+    def find_in(self, text: str) -> Optional[str]:
+        """
+        The longest known app name occurring as whole words in `text`
+        (leftmost on ties), e.g. "firefox private browsing please" ->
+        "firefox private browsing".
+        """
+        self.refresh()
+        words = normalize_tokens(text)
+        best = None
+        for start, word in enumerate(words):
+            for tokens in self._by_first.get(word, ()):
+                if best is not None and len(tokens) <= len(best):
+                    break
+                if words[start:start + len(tokens)] == tokens:
+                    best = tokens
+                    break
+        return self._by_tokens[best] if best else None
+
+
+_indexes: Dict[str, AppIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_app_index(filepath=APPS_JSON) -> AppIndex:
+    """Shared index for a mappings file."""
+    with _indexes_lock:
+        if filepath not in _indexes:
+            _indexes[filepath] = AppIndex(filepath)
+        return _indexes[filepath]
@@ -1,20 +1,29 @@
-import json
 import subprocess
 import os
-from difflib import get_close_matches
+import shlex
+import shutil
+import threading
+
+from skills.system.app_index import APPS_JSON, get_app_index
+from skills.system.fuzzy_matcher import FuzzyAppMatcher
+
+# (mapping, matcher built from it); the index swaps in a new dict on every reload
+_fuzzy = (None, None)
+_fuzzy_lock = threading.Lock()
 
 # --- Load the app mappings from a JSON file ---
-def load_app_mappings(filepath='assets/apps/apps.json'):
-    """Load app mappings from JSON file."""
+def load_app_mappings(filepath=APPS_JSON):
+    """App mappings from the JSON file (cached; re-read when the file changes)."""
+    return get_app_index(filepath).mappings()
+
+def _launch_command(path):
+    """argv for a mapping value: an executable path, or a command line (Linux .desktop Exec)."""
+    if os.name == 'nt' or os.path.exists(path):
+        return [path]
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"⚠️ Could not find app mappings file: {filepath}")
-        return {}
-    except json.JSONDecodeError:
-        print(f"⚠️ Error reading JSON file: {filepath}")
-        return {}
+        return shlex.split(path)
+    except ValueError:
+        return [path]
 
 # --- Try to open the app if it exists ---
 def open_app(app_name, app_map):
@@ -22,9 +31,11 @@ def open_app(app_name, app_map):
     app_name = app_name.lower()
     if app_name in app_map:
         path = app_map[app_name]
-        if os.path.exists(path) or path.endswith('.exe') or path in ['notepad.exe', 'calc.exe']:
+        argv = _launch_command(path)
+        if (os.path.exists(path) or path.endswith('.exe') or path in ['notepad.exe', 'calc.exe']
+                or (argv and shutil.which(argv[0]))):
             try:
-                subprocess.Popen([path])
+                subprocess.Popen(argv)
                 print(f"✅ Opening {app_name}")
                 return True
             except Exception as e:
@@ -38,23 +49,34 @@ def open_app(app_name, app_map):
         return False
 
 # --- Fuzzy match user input to closest known app name ---
+def fuzzy_matcher(app_map):
+    """The fuzzy matcher for this mapping, built on first use and reused until the mapping changes."""
+    global _fuzzy
+    with _fuzzy_lock:
+        if _fuzzy[0] is not app_map:
+            _fuzzy = (app_map, FuzzyAppMatcher(app_map.keys()))
+        return _fuzzy[1]
+
 def fuzzy_find_app(user_input, app_map):
     """Find the closest matching app name using fuzzy matching."""
-    keys = app_map.keys()
-    matches = get_close_matches(user_input.lower(), keys, n=1, cutoff=0.6)
-    return matches[0] if matches else None
+    matches = fuzzy_matcher(app_map).match(user_input, n=3, cutoff=0.6)
+    if len(matches) > 1:
+        print(f"[DEBUG] Fuzzy app candidates: {matches}")
+    return matches[0][0] if matches else None
 
 # --- Launch app by name with fuzzy matching ---
 def launch_app(app_name):
     """Launch an app by name, with fuzzy matching support."""
-    app_map = load_app_mappings()
+    index = get_app_index()
+    app_map = index.mappings()
     if not app_map:
         print("⚠️ No app mappings available")
         return False
     
-    # Try exact match first
-    if open_app(app_name, app_map):
-        return True
+    # Try exact match first (ignoring case and punctuation)
+    known = index.resolve(app_name)
+    if known:
+        return open_app(known, app_map)
     
     # Try fuzzy match
     matched_app = fuzzy_find_app(app_name, app_map)
@@ -0,0 +1,144 @@
+# skills/system/fuzzy_matcher.py
+
+"""
+Fuzzy app-name matching for misheard or misspelled app names.
+
+The matcher is built once per set of names: an inverted index from
+character trigrams to names, and one from phonetic keys to names. A query
+only scores the names sharing a trigram or a phonetic key with it, instead
+of running difflib against every name.
+
+Speech recognition errors are mostly phonetic ("crome", "spot if i",
+"kapcut"), so the score blends trigram similarity (Dice coefficient) with
+phonetic agreement. Phonetic keys are Soundex codes computed after a few
+Metaphone-style spelling rewrites (ph -> f, hard c -> k, ...), which lets
+"capcut" and "kapcut" share a key even though plain Soundex keeps the
+first letter.
+"""
+
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+from skills.system.app_index import normalize_tokens
+
+# Metaphone-style rewrites applied before Soundex, in order
+_REWRITES = [
+    (re.compile(r"^kn|^gn|^pn|^wr"), lambda m: m.group(0)[1]),
+    (re.compile(r"ph"), lambda m: "f"),
+    (re.compile(r"chr"), lambda m: "kr"),
+    (re.compile(r"ck"), lambda m: "k"),
+    (re.compile(r"c(?=[eiy])"), lambda m: "s"),
+    (re.compile(r"[cq]"), lambda m: "k"),
+    (re.compile(r"x"), lambda m: "ks"),
+    (re.compile(r"wh"), lambda m: "w"),
+    (re.compile(r"gh(?![aeiou])"), lambda m: ""),
+    (re.compile(r"z"), lambda m: "s"),
+]
+
+_SOUNDEX = {letter: str(code) for code, letters in enumerate(
+    ["aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"]) for letter in letters}
+
+
+def soundex(word: str) -> str:
+    """Classic four-character Soundex code ("robert" -> "R163"); "" for no letters."""
+    letters = [c for c in word.lower() if c in _SOUNDEX]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX[letters[0]]
+    for letter in letters[1:]:
+        digit = _SOUNDEX[letter]
+        if digit != "0" and digit != previous:
+            code += digit
+        # h and w do not separate letters with the same code; vowels do
+        if letter not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def phonetic_key(word: str) -> str:
+    word = word.lower()
+    for pattern, replacement in _REWRITES:
+        word = pattern.sub(replacement, word)
+    # Numbers in names ("office 365") only match exactly
+    return soundex(word) if word.isalpha() else word
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _phonetic_keys(tokens: Tuple[str, ...]) -> Set[str]:
+    keys = {phonetic_key(token) for token in tokens}
+    # Word splits are unreliable in transcripts ("spot if i" for "spotify")
+    keys.add("=" + phonetic_key("".join(tokens)))
+    keys.discard("")
+    return keys
+
+
+class FuzzyAppMatcher:
+    """Ranked fuzzy lookup over a fixed set of app names."""
+
+    def __init__(self, names: Iterable[str], phonetic_weight=0.4):
+        self.phonetic_weight = phonetic_weight
+        self._names: List[str] = []
+        self._gram_counts: List[int] = []
+        self._token_counts: List[int] = []
+        self._by_gram: Dict[str, List[int]] = {}
+        self._by_key: Dict[str, List[int]] = {}
+        for name in names:
+            tokens = normalize_tokens(name)
+            if not tokens:
+                continue
+            i = len(self._names)
+            self._names.append(name)
+            grams = _trigrams(" ".join(tokens))
+            self._gram_counts.append(len(grams))
+            self._token_counts.append(len(tokens))
+            for gram in grams:
+                self._by_gram.setdefault(gram, []).append(i)
+            for key in _phonetic_keys(tokens):
+                self._by_key.setdefault(key, []).append(i)
+
+    def __len__(self):
+        return len(self._names)
+
+    def match(self, query: str, n=5, cutoff=0.5) -> List[Tuple[str, float]]:
+        """Up to `n` (name, score) pairs scoring at least `cutoff`, best first; scores are 0-1."""
+        tokens = normalize_tokens(query)
+        if not tokens:
+            return []
+        grams = _trigrams(" ".join(tokens))
+        keys = _phonetic_keys(tokens)
+
+        # Overlaps are counted from the posting lists; names sharing
+        # nothing with the query are never looked at
+        shared_grams: Dict[int, int] = {}
+        for gram in grams:
+            for i in self._by_gram.get(gram, ()):
+                shared_grams[i] = shared_grams.get(i, 0) + 1
+        joined = "=" + phonetic_key("".join(tokens))
+        shared_keys: Dict[int, int] = {}
+        for key in keys - {joined}:
+            for i in self._by_key.get(key, ()):
+                shared_keys[i] = shared_keys.get(i, 0) + 1
+        same_sound = set(self._by_key.get(joined, ()))
+
+        scored = []
+        for i in set(shared_grams) | set(shared_keys) | same_sound:
+            dice = 2.0 * shared_grams.get(i, 0) / (len(grams) + self._gram_counts[i])
+            if i in same_sound:
+                phonetic = 1.0
+            else:
+                phonetic = shared_keys.get(i, 0) / max(len(tokens), self._token_counts[i])
+            score = (1 - self.phonetic_weight) * dice + self.phonetic_weight * phonetic
+            if score >= cutoff:
+                scored.append((score, self._names[i]))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        return [(name, round(score, 3)) for score, name in scored[:n]]
+
+    def best(self, query: str, cutoff=0.5):
+        """The best matching name, or None."""
+        matches = self.match(query, n=1, cutoff=cutoff)
+        return matches[0][0] if matches else None
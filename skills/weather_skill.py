@@ -8,6 +8,8 @@ import requests
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 
+from core import resilience
+
 
 class WeatherSkill:
     """Skill for weather information retrieval"""
@@ -22,6 +24,20 @@ class WeatherSkill:
         self.openweather_base = "https://api.openweathermap.org/data/2.5"
         self.weatherapi_base = "https://api.weatherapi.com/v1"
     
+    def _get(self, api: str, url: str, params: Dict) -> requests.Response:
+        """
+        GET through the API's circuit breaker with one jittered retry; an API
+        that is down fails immediately so the other one can be tried.
+        """
+        return resilience.call(
+            api,
+            lambda timeout: requests.get(url, params=params, timeout=timeout),
+            timeout=10,
+            retries=1,
+            retry_on=(requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+            is_failure=lambda r: r.status_code >= 500 or r.status_code == 429,
+        )
+    
     def get_current_weather_openweather(self, location: str) -> Optional[Dict]:
         """
         Get current weather using OpenWeatherMap API
@@ -43,7 +59,7 @@ class WeatherSkill:
                 "units": "metric"
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get("openweather", url, params)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -74,7 +90,7 @@ class WeatherSkill:
                 "aqi": "no"
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get("weatherapi", url, params)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -107,7 +123,7 @@ class WeatherSkill:
                 "cnt": days * 8  # 8 forecasts per day (3-hour intervals)
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get("openweather", url, params)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -141,7 +157,7 @@ class WeatherSkill:
                 "alerts": "no"
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get("weatherapi", url, params)
             if response.status_code == 200:
                 return response.json()
             else:
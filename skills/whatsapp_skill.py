@@ -7,6 +7,8 @@ import os
 import requests
 from typing import Optional
 
+from core import resilience
+
 
 class WhatsAppSkill:
     """Skill for WhatsApp messaging operations"""
@@ -44,7 +46,16 @@ class WhatsAppSkill:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            # Circuit breaker and timeout, but no retries: a resent POST could
+            # deliver the message twice
+            response = resilience.call(
+                "whatsapp",
+                lambda timeout: requests.post(url, json=payload, headers=headers, timeout=timeout),
+                timeout=10,
+                retries=0,
+                retry_on=(requests.exceptions.RequestException,),
+                is_failure=lambda r: r.status_code >= 500,
+            )
             if response.status_code == 200:
                 print(f"WhatsApp message sent successfully to {to_number}")
                 return True
@@ -1,17 +1,28 @@
+import sys
 import time
 
+# Heavy libraries that should only load once a skill / the TTS model needs them
+HEAVY_MODULES = ["kokoro", "torch", "browser_use"]
+
 start = time.time()
 from core.tts import speak
 print("tts loaded in", time.time() - start)
 
 start = time.time()
-from skills.system.app_launcher import launch_notepad, launch_app, load_app_mappings
-print("app_launcher loaded in", time.time() - start)
+from core.command_router import route_command, SKILLS
+print("command_router loaded in", time.time() - start)
+
+start = time.time()
+import main
+print("main loaded in", time.time() - start)
+
+print("heavy modules imported at startup:", [m for m in HEAVY_MODULES if m in sys.modules] or "none")
+print("skills loaded at startup:", [skill.name for skill in SKILLS if skill.loaded] or "none")
 
 start = time.time()
-from skills.general.hello_skill import say_hello
+SKILLS.get("greeting").load()
 print("hello_skill loaded in", time.time() - start)
 
 start = time.time()
-from skills.browser_skill import run_browser_task_sync
+SKILLS.get("browse").load()
 print("browser_skill loaded in", time.time() - start)
@@ -0,0 +1,79 @@
+# tests/test_app_discovery.py
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.system.app_discovery import AppDiscovery, DesktopEntryBackend
+
+PYTHON = os.path.realpath(sys.executable)
+
+def desktop_entry(name, exec_line, extra=""):
+    return f"[Desktop Entry]\nType=Application\nName={name}\nExec={exec_line}\n{extra}"
+
+class CountingBackend(DesktopEntryBackend):
+    def __init__(self, directories):
+        super().__init__(directories)
+        self.resolved = []
+
+    def resolve(self, path):
+        self.resolved.append(os.path.basename(path))
+        return super().resolve(path)
+
+class TestAppDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.user_apps = os.path.join(self.directory, "user")
+        self.system_apps = os.path.join(self.directory, "system")
+        os.makedirs(self.user_apps)
+        os.makedirs(self.system_apps)
+        self.write(self.system_apps, "editor.desktop", desktop_entry("Editor", f"{PYTHON} -m idlelib %F"))
+        self.write(self.system_apps, "shell.desktop", desktop_entry("Shell", f"{PYTHON} %U"))
+        self.write(self.system_apps, "hidden.desktop", desktop_entry("Hidden", PYTHON, "NoDisplay=true\n"))
+        self.write(self.system_apps, "missing.desktop", desktop_entry("Missing", "no-such-binary-xyz"))
+        self.backend = CountingBackend([self.user_apps, self.system_apps])
+        self.discovery = AppDiscovery(self.backend, cache_path=os.path.join(self.directory, "cache.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, directory, name, content, mtime=None):
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_desktop_entries_become_launch_commands(self):
+        apps = self.discovery.scan()
+        self.assertEqual(apps, {"editor": f"{PYTHON} -m idlelib", "shell": PYTHON})
+
+    def test_only_changed_files_are_resolved_again(self):
+        self.discovery.scan()
+        self.assertEqual(len(self.backend.resolved), 4)
+
+        self.backend.resolved.clear()
+        self.assertEqual(self.discovery.scan()["shell"], PYTHON)
+        self.assertEqual(self.backend.resolved, [])
+
+        shell = os.path.join(self.system_apps, "shell.desktop")
+        self.write(self.system_apps, "shell.desktop", desktop_entry("Terminal", PYTHON),
+                   mtime=os.path.getmtime(shell) + 10)
+        os.remove(os.path.join(self.system_apps, "editor.desktop"))
+        apps = self.discovery.scan()
+        self.assertEqual(self.backend.resolved, ["shell.desktop"])
+        self.assertEqual(apps, {"terminal": PYTHON})
+        self.assertEqual(self.discovery.last_stats["removed"], 1)
+
+    def test_user_entries_override_system_ones(self):
+        self.write(self.user_apps, "my-shell.desktop", desktop_entry("Shell", f"{PYTHON} -i"))
+        self.assertEqual(self.discovery.scan()["shell"], f"{PYTHON} -i")
+
+if __name__ == '__main__':
+    unittest.main()
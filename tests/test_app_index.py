@@ -0,0 +1,70 @@
+# tests/test_app_index.py
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.system.app_index import AppIndex
+
+APPS = {
+    "firefox": "firefox.exe",
+    "firefox private browsing": "private_browsing.exe",
+    "notepad": "notepad.exe",
+    "notepad++": "notepad++.exe",
+    "visual studio code": "code.exe",
+}
+
+class TestAppIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "apps.json")
+        self.write(APPS)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, apps, mtime=None):
+        with open(self.path, "w") as f:
+            json.dump(apps, f)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_finds_longest_app_name_in_command(self):
+        index = AppIndex(self.path)
+        self.assertEqual(index.find_in("firefox private browsing please"), "firefox private browsing")
+        self.assertEqual(index.find_in("the firefox thing"), "firefox")
+        self.assertEqual(index.find_in("Visual Studio Code, now"), "visual studio code")
+        self.assertIsNone(index.find_in("visual studio"))
+        self.assertIsNone(index.find_in("firefoxes"))
+
+    def test_resolve_ignores_case_and_punctuation(self):
+        index = AppIndex(self.path)
+        self.assertEqual(index.resolve("Notepad++"), "notepad++")
+        self.assertEqual(index.resolve("NOTEPAD"), "notepad")
+        self.assertEqual(index.resolve("visual-studio code"), "visual studio code")
+        self.assertIsNone(index.resolve("spotify"))
+
+    def test_reloads_only_when_file_changes(self):
+        index = AppIndex(self.path)
+        self.assertEqual(len(index.mappings()), len(APPS))
+        index.mappings()
+        self.assertEqual(index.version, 1)
+
+        self.write({**APPS, "spotify": "spotify.exe"}, mtime=os.path.getmtime(self.path) + 10)
+        self.assertEqual(index.resolve("spotify"), "spotify")
+        self.assertEqual(index.version, 2)
+
+    def test_missing_file_gives_empty_mapping(self):
+        index = AppIndex(os.path.join(self.directory, "missing.json"))
+        self.assertEqual(index.mappings(), {})
+        self.assertIsNone(index.find_in("open firefox"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+# tests/test_async_openrouter_client.py
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+import sys
+import os
+
+import httpx
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.async_openrouter_client import AsyncOpenRouterClient, _background_loop, percentile
+from core.resilience import Deadline, DeadlineExceeded, ServiceUnavailable, get_breaker
+from core.model_router import ModelRouter, ModelSpec
+
+def sse_body(words):
+    """Server-sent events as OpenRouter streams them."""
+    events = [": OPENROUTER PROCESSING\n\n"]
+    events += [f"data: {json.dumps({'choices': [{'delta': {'content': w}}]})}\n\n" for w in words]
+    return "".join(events) + "data: [DONE]\n\n"
+
+class DelayedStream(httpx.AsyncByteStream):
+    def __init__(self, body, delay):
+        self.body = body
+        self.delay = delay
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.delay)
+        for line in self.body.splitlines(keepends=True):
+            yield line.encode()
+
+def make_client(delays, model="primary", **kwargs):
+    """Client whose requests are answered locally after a per-model delay (None = HTTP 503)."""
+    async def handler(request):
+        model = json.loads(request.content)["model"]
+        if delays[model] is None:
+            return httpx.Response(503)
+        return httpx.Response(200, stream=DelayedStream(sse_body([model, " done."]), delays[model]))
+
+    client = AsyncOpenRouterClient(api_key="test", model=model, **kwargs)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+class TestAsyncOpenRouterClient(unittest.TestCase):
+
+    def test_streams_deltas(self):
+        """Deltas are parsed from the event stream; comments are skipped."""
+        client = make_client({"primary": 0.0}, backup_model=None)
+        self.assertEqual(client.get_response_sync([]), "primary done.")
+        self.assertEqual(client.latencies.count("primary"), 1)
+
+    def test_hedges_to_backup_when_primary_is_slow(self):
+        """A backup request fires after the hedge delay and the faster one wins."""
+        client = make_client({"primary": 2.0, "backup": 0.0}, backup_model="backup", hedge_delay=0.1)
+        start = time.time()
+        self.assertEqual(client.get_response_sync([]), "backup done.")
+        self.assertLess(time.time() - start, 1.0)
+
+    def test_no_hedge_when_primary_is_fast(self):
+        client = make_client({"primary": 0.0, "backup": 0.0}, backup_model="backup", hedge_delay=0.5)
+        self.assertEqual(client.get_response_sync([]), "primary done.")
+        self.assertEqual(client.latencies.count("backup"), 0)
+
+    def test_fails_over_to_backup(self):
+        """A failing primary is not retried when a backup model is available."""
+        client = make_client({"primary": None, "backup": 0.0}, backup_model="backup", hedge_delay=5.0)
+        start = time.time()
+        self.assertEqual(client.get_response_sync([]), "backup done.")
+        self.assertLess(time.time() - start, 1.0)
+
+    def test_router_picks_models(self):
+        router = ModelRouter(models=[ModelSpec("primary", 0.0), ModelSpec("backup", 1.0)])
+        client = make_client({"primary": None, "backup": 0.0}, router=router)
+        self.assertEqual(client.get_response_sync([{"role": "user", "content": "Hi"}]), "backup done.")
+        self.assertEqual(router.report()["primary"]["failure_rate"], 1.0)
+        self.assertEqual(router.report()["backup"]["samples"], 1)
+        # One latency record, read by both the router and the hedge delay
+        self.assertIs(client.latencies, router.latencies)
+        self.assertEqual(router.latencies.count("backup"), 1)
+
+    def test_cancel_ends_stream(self):
+        """cancel() from another thread ends the stream without waiting for the model."""
+        client = make_client({"primary": 5.0}, backup_model=None)
+        threading.Timer(0.1, client.cancel).start()
+        start = time.time()
+        self.assertIsNone(client.get_response_sync([]))
+        self.assertLess(time.time() - start, 1.0)
+
+    def test_reply_stream_cancel_is_per_request(self):
+        """A speculative reply can be dropped without touching other requests."""
+        client = make_client({"primary": 0.2}, backup_model=None)
+        speculative = client.stream_sync([])
+        kept = client.stream_sync([])
+        speculative.cancel()
+        self.assertEqual(list(speculative), [])
+        self.assertEqual("".join(kept), "primary done.")
+        self.assertEqual(client.cancel(), 0)
+
+    def test_error_and_timing_belong_to_each_reply(self):
+        """A concurrent request (e.g. a background summary) cannot clear another reply's error."""
+        client = make_client({"unreachable": None}, model="unreachable", backup_model=None, max_retries=1)
+        failed = client.stream_sync([])
+        self.assertEqual(list(failed), [])
+        self.assertIsInstance(failed.error, ServiceUnavailable)
+
+        client = make_client({"primary": 0.0}, backup_model=None)
+        ok = client.stream_sync([])
+        self.assertEqual("".join(ok), "primary done.")
+        self.assertIsNone(ok.error)
+        self.assertEqual(ok.timing["model"], "primary")
+        self.assertIn("total", ok.timing)
+        self.assertIsInstance(failed.error, ServiceUnavailable)
+
+    def half_open(self, model):
+        breaker = get_breaker(f"openrouter:{model}")
+        breaker.record_failure()
+        breaker._opened_at = time.time() - breaker.reset_timeout - 1
+        self.assertEqual(breaker.state, "half_open")
+        return breaker
+
+    def test_client_error_during_half_open_trial_frees_the_breaker(self):
+        async def handler(request):
+            return httpx.Response(400)
+
+        client = AsyncOpenRouterClient(api_key="test", model="half-open-400", backup_model=None)
+        client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        breaker = self.half_open("half-open-400")
+        with self.assertRaises(httpx.HTTPStatusError):
+            _background_loop().submit(
+                client._open_with_retries("half-open-400", [], Deadline(5))).result()
+        self.assertFalse(breaker._trial_in_flight)
+        breaker.allow()  # the next trial is let through
+
+    def test_deadline_during_half_open_trial_frees_the_breaker(self):
+        client = make_client({"half-open-deadline": 0.0}, model="half-open-deadline", backup_model=None)
+        breaker = self.half_open("half-open-deadline")
+        with self.assertRaises(DeadlineExceeded):
+            _background_loop().submit(
+                client._open_with_retries("half-open-deadline", [], Deadline(0))).result()
+        self.assertFalse(breaker._trial_in_flight)
+        breaker.allow()
+
+    def test_hedge_delay_tracks_p95(self):
+        client = AsyncOpenRouterClient(api_key="test", hedge_delay=2.0)
+        self.assertEqual(client.hedge_after(), 2.0)
+        for i in range(1, 21):
+            client._record_latency(client.model, i / 10)
+        self.assertAlmostEqual(client.hedge_after(), percentile([i / 10 for i in range(1, 21)], 95))
+        self.assertAlmostEqual(client.hedge_after(), 1.9)
+
+if __name__ == '__main__':
+    unittest.main()
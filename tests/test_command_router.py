@@ -0,0 +1,69 @@
+# tests/test_command_router.py
+
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.command_router as command_router
+from skills.system.app_index import AppIndex
+
+APPS = {"firefox": "firefox.exe", "spotify": "spotify.exe", "discord": "discord.exe", "capcut": "capcut.exe"}
+
+class TestCommandRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, "apps.json")
+        with open(path, "w") as f:
+            json.dump(APPS, f)
+        index = AppIndex(path)
+        self.launched = []
+        self.patches = [
+            mock.patch.object(command_router, "get_app_index", lambda: index),
+            mock.patch.object(command_router, "speak", lambda text: None),
+            mock.patch.object(command_router.SKILLS.get("open_app"), "_function",
+                              lambda app_name: self.launched.append(app_name) or True),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.directory)
+
+    def test_launches_apps_after_spoken_lead_ins(self):
+        commands = {
+            "open firefox": "firefox",
+            "okay open firefox": "firefox",
+            "now open firefox": "firefox",
+            "so open spotify": "spotify",
+            "yeah open firefox": "firefox",
+            "and launch discord": "discord",
+            "alright, launch capcut": "capcut",
+            "please open spotify": "spotify",
+        }
+        for command, app in commands.items():
+            with self.subTest(command=command):
+                self.assertTrue(command_router.route_command(command))
+                self.assertEqual(self.launched.pop(), app)
+
+    def test_trigger_word_inside_a_question_goes_to_the_llm(self):
+        for command in ["how do I start a business", "so how do I start a business"]:
+            with self.subTest(command=command):
+                self.assertFalse(command_router.route_command(command))
+        self.assertEqual(self.launched, [])
+
+    def test_extract_app_name_drops_lead_ins(self):
+        self.assertEqual(command_router.extract_app_name("okay open firefox"), "firefox")
+        self.assertEqual(command_router.extract_app_name("and launch some new app"), "some new app")
+
+if __name__ == '__main__':
+    unittest.main()
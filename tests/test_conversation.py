@@ -0,0 +1,39 @@
+# tests/test_conversation.py
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.conversation as conversation
+
+class TestResponseCaching(unittest.TestCase):
+
+    def setUp(self):
+        conversation.memory.reset()
+
+    def tearDown(self):
+        conversation.memory.reset()
+
+    def test_time_dependent_questions_are_not_cached(self):
+        for question in ["What time is it?", "What's today's date", "what's the weather like",
+                         "Any news?", "What's the latest on the election", "Who is the current president"]:
+            with self.subTest(question=question):
+                self.assertFalse(conversation._cacheable(question))
+
+    def test_standing_questions_are_cached(self):
+        for question in ["Tell me a joke", "What can you do?", "How far away is the moon"]:
+            with self.subTest(question=question):
+                self.assertTrue(conversation._cacheable(question))
+
+    def test_follow_ups_are_not_cached_mid_conversation(self):
+        self.assertTrue(conversation._cacheable("Tell me more about it"))
+        conversation.memory.add("user", "Who wrote Dune?")
+        conversation.memory.add("assistant", "Frank Herbert.")
+        self.assertFalse(conversation._cacheable("Tell me more about it"))
+        self.assertTrue(conversation._cacheable("Tell me a joke"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_conversation_memory.py
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.conversation_memory import ConversationMemory, estimate_tokens
+
+def add_exchanges(memory, count):
+    for i in range(count):
+        memory.add("user", f"Question number {i} about something fairly long and wordy.")
+        memory.add("assistant", f"Answer number {i}. It has a second sentence too.")
+
+class TestConversationMemory(unittest.TestCase):
+    
+    def test_messages_keep_stable_prefix(self):
+        """The system prompt leads every request and earlier turns are kept."""
+        memory = ConversationMemory("You are Sarah.", max_tokens=1000)
+        first = memory.messages("Hello")
+        memory.add("user", "Hello")
+        memory.add("assistant", "Hi, Sir.")
+        second = memory.messages("How are you?")
+        self.assertEqual(first[0], second[0])
+        self.assertEqual([m["content"] for m in second[1:]], ["Hello", "Hi, Sir.", "How are you?"])
+    
+    def test_compact_folds_old_turns_into_summary(self):
+        calls = []
+        def summarizer(previous, turns):
+            calls.append(len(turns))
+            return "summary"
+        memory = ConversationMemory("You are Sarah.", max_tokens=80, summarizer=summarizer)
+        add_exchanges(memory, 5)
+        memory.compact()
+        self.assertLessEqual(memory.history_tokens, 80)
+        self.assertEqual(memory.turns[0]["role"], "user")
+        self.assertEqual(sum(calls), memory.folded_turns)
+        messages = memory.messages()
+        self.assertIn("summary", messages[1]["content"])
+    
+    def test_under_budget_is_untouched(self):
+        memory = ConversationMemory("You are Sarah.", max_tokens=10000)
+        add_exchanges(memory, 3)
+        memory.compact()
+        self.assertEqual(len(memory.turns), 6)
+        self.assertEqual(memory.summary, "")
+    
+    def test_failed_summarizer_falls_back_to_extractive(self):
+        def summarizer(previous, turns):
+            raise RuntimeError("offline")
+        memory = ConversationMemory("You are Sarah.", max_tokens=60, summary_tokens=200,
+                                    summarizer=summarizer)
+        add_exchanges(memory, 4)
+        memory.compact()
+        self.assertIn("User: Question number", memory.summary)
+    
+    def test_summary_from_before_a_reset_is_dropped(self):
+        memory = None
+        def summarizer(previous, turns):
+            # A new session starts while the old turns are being summarized
+            memory.reset()
+            memory.add("user", "New session")
+            return "old conversation"
+        memory = ConversationMemory("You are Sarah.", max_tokens=80, summarizer=summarizer)
+        add_exchanges(memory, 5)
+        memory.compact()
+        self.assertEqual(memory.summary, "")
+        self.assertEqual(memory.folded_turns, 0)
+        self.assertEqual([m["content"] for m in memory.messages()[1:]], ["New session"])
+    
+    def test_stats_report_per_turn_tokens(self):
+        memory = ConversationMemory("You are Sarah.")
+        memory.add("user", "Hello there")
+        stats = memory.stats()
+        self.assertEqual(stats["turn_tokens"], [estimate_tokens("Hello there")])
+        memory.reset()
+        self.assertEqual(memory.stats()["history_tokens"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
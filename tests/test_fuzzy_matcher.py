@@ -0,0 +1,59 @@
+# tests/test_fuzzy_matcher.py
+
+import random
+import string
+import time
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.system.fuzzy_matcher import FuzzyAppMatcher, phonetic_key, soundex
+
+APPS = ["chrome", "spotify", "capcut", "firefox", "firefox private browsing", "notepad",
+        "onedrive", "visual studio code", "calculator", "office 365"]
+
+class TestFuzzyAppMatcher(unittest.TestCase):
+
+    def test_soundex(self):
+        self.assertEqual(soundex("Robert"), "R163")
+        self.assertEqual(soundex("Rupert"), "R163")
+        self.assertEqual(soundex("Ashcraft"), "A261")
+        self.assertEqual(soundex("Tymczak"), "T522")
+
+    def test_phonetic_key_handles_spelling_variants(self):
+        self.assertEqual(phonetic_key("kapcut"), phonetic_key("capcut"))
+        self.assertEqual(phonetic_key("crome"), phonetic_key("chrome"))
+        self.assertEqual(phonetic_key("foto"), phonetic_key("photo"))
+
+    def test_matches_misheard_names(self):
+        matcher = FuzzyAppMatcher(APPS)
+        self.assertEqual(matcher.best("crome"), "chrome")
+        self.assertEqual(matcher.best("spot if i"), "spotify")
+        self.assertEqual(matcher.best("kapcut"), "capcut")
+        self.assertEqual(matcher.best("note pad"), "notepad")
+        self.assertEqual(matcher.best("office 365"), "office 365")
+        self.assertIsNone(matcher.best("weather tomorrow"))
+
+    def test_ranked_candidates(self):
+        matches = FuzzyAppMatcher(APPS).match("fire fox", n=3)
+        self.assertEqual(matches[0][0], "firefox")
+        self.assertEqual([name for name, _ in matches][1:], ["firefox private browsing"])
+        self.assertTrue(all(a[1] >= b[1] for a, b in zip(matches, matches[1:])))
+
+    def test_lookup_is_fast_on_large_mappings(self):
+        rng = random.Random(7)
+        names = APPS + ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 14)))
+                        for _ in range(3000)]
+        matcher = FuzzyAppMatcher(names)
+        queries = ["crome", "spot if i", "kapcut", "fire fox", "visual studio"] * 20
+        start = time.perf_counter()
+        for query in queries:
+            matcher.match(query)
+        self.assertLess((time.perf_counter() - start) / len(queries), 0.005)
+        self.assertEqual(matcher.best("crome"), "chrome")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# tests/test_intent_matcher.py
+
+import time
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.intent_matcher import IntentMatcher
+
+def make_matcher():
+    matcher = IntentMatcher()
+    matcher.add("browse", ["go to", "search", "look up"], weight=3.0)
+    matcher.add("open_app", ["open", "launch", "start", "run"], weight=2.0)
+    matcher.add("greeting", ["hello", "hi", "hey", "good morning"], weight=1.5)
+    return matcher
+
+class TestIntentMatcher(unittest.TestCase):
+
+    def test_matches_whole_words_only(self):
+        """Trigger words inside other words ("this", "brunch") do not count."""
+        matcher = make_matcher()
+        self.assertEqual(matcher.match("what is this"), [])
+        self.assertEqual(matcher.match("where should we go for brunch"), [])
+        self.assertEqual(matcher.match("hi there")[0].intent, "greeting")
+
+    def test_anchored_phrase_beats_later_one(self):
+        matcher = make_matcher()
+        best = matcher.best("please open firefox and say hello")
+        self.assertEqual(best.intent, "open_app")
+        self.assertTrue(best.anchored)
+        self.assertEqual(best.score, 2.0)
+
+    def test_phrase_inside_sentence_scores_half(self):
+        matcher = make_matcher()
+        self.assertEqual(matcher.best("how do i start a business").score, 1.0)
+        self.assertIsNone(matcher.best("how do i start a business", min_score=1.5))
+
+    def test_returns_all_candidates_with_multi_word_phrases(self):
+        matcher = make_matcher()
+        matches = matcher.match("good morning, can you look up the news")
+        # Equal scores: the higher-weight intent wins
+        self.assertEqual([m.intent for m in matches], ["browse", "greeting"])
+        self.assertEqual(matches[0].phrase, "look up")
+        self.assertEqual((matches[0].start, matches[0].end), (4, 6))
+        self.assertEqual(matches[1].phrase, "good morning")
+
+    def test_cost_does_not_grow_with_intent_count(self):
+        small = make_matcher()
+        large = make_matcher()
+        for i in range(5000):
+            large.add(f"skill{i}", [f"trigger{i} word", f"phrase{i}"])
+        command = "could you please tell me what the weather looks like tomorrow " * 3
+
+        def timed(matcher):
+            start = time.perf_counter()
+            for _ in range(200):
+                matcher.match(command)
+            return time.perf_counter() - start
+
+        self.assertLess(timed(large), timed(small) * 3 + 0.05)
+        self.assertEqual(large.best("phrase42 now").intent, "skill42")
+
+if __name__ == '__main__':
+    unittest.main()
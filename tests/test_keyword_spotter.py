@@ -0,0 +1,85 @@
+# tests/test_keyword_spotter.py
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.keyword_spotter import MfccExtractor, TemplateKeywordSpotter, subsequence_dtw
+
+SAMPLE_RATE = 16000
+FRAME = 480  # 30 ms
+
+def word(f0=220, f1=440, seconds=0.6, seed=0):
+    """A voiced-sounding glide from f0 to f1 Hz, standing in for a spoken word."""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(np.linspace(f0, f1, len(t))) / SAMPLE_RATE
+    x = sum(np.sin(k * phase) / k for k in range(1, 6)) * np.hanning(len(t))
+    x += np.random.default_rng(seed).normal(0, 0.01, len(t))
+    return (x / np.abs(x).max() * 8000).astype(np.int16)
+
+def noise(seconds, level=30, seed=1):
+    return np.random.default_rng(seed).normal(0, level, int(SAMPLE_RATE * seconds)).astype(np.int16)
+
+def template(samples):
+    return MfccExtractor().sequence(samples, FRAME)
+
+def feed(spotter, samples):
+    """Stream audio frame by frame; returns the keyword hits."""
+    hits = []
+    for i in range(len(samples) // FRAME):
+        hit = spotter.process(samples[i * FRAME:(i + 1) * FRAME].tobytes())
+        if hit:
+            hits.append(hit)
+    return hits
+
+class TestKeywordSpotter(unittest.TestCase):
+
+    def test_mfcc_shape(self):
+        features = template(word())
+        self.assertEqual(features.shape, (len(word()) // FRAME, 12))
+        self.assertTrue(np.all(np.isfinite(features)))
+
+    def test_template_matches_itself(self):
+        features = template(word())
+        normalized = features - features.mean(axis=0)
+        self.assertEqual(subsequence_dtw(normalized, normalized), 0.0)
+        # Free start and end: the word found inside a longer window
+        window = template(np.concatenate([noise(0.3), word(), noise(0.3)]))
+        self.assertLess(subsequence_dtw(normalized, window - window.mean(axis=0)),
+                        subsequence_dtw(normalized, template(word(600, 300))))
+
+    def test_spots_keyword_in_stream(self):
+        spotter = TemplateKeywordSpotter([template(word())])
+        hits = feed(spotter, np.concatenate([noise(1.0), word(seed=5), noise(1.0)]))
+        self.assertEqual(hits, ["sarah"])
+        self.assertLessEqual(spotter.last_score, spotter.threshold)
+
+    def test_unrelated_audio_does_not_match(self):
+        spotter = TemplateKeywordSpotter([template(word())])
+        other_word = word(600, 300, seed=5)
+        loud_noise = np.random.default_rng(3).normal(0, 3000, SAMPLE_RATE).astype(np.int16)
+        for samples in (other_word, loud_noise):
+            spotter.reset()
+            self.assertEqual(feed(spotter, np.concatenate([noise(1.0), samples, noise(1.0)])), [])
+            self.assertGreater(spotter.last_score, spotter.threshold)
+        # Quiet audio never reaches the DTW at all
+        self.assertEqual(feed(spotter, noise(2.0)), [])
+
+    def test_threshold_is_calibrated_from_templates(self):
+        templates = [template(word(seed=seed)) for seed in range(3)]
+        spotter = TemplateKeywordSpotter(templates)
+        self.assertGreater(spotter.threshold, 0.0)
+        self.assertEqual(TemplateKeywordSpotter(templates[:1]).threshold, 6.0)
+
+    def test_explicit_zero_threshold_is_kept(self):
+        spotter = TemplateKeywordSpotter([template(word(seed=seed)) for seed in range(3)], threshold=0.0)
+        self.assertEqual(spotter.threshold, 0.0)
+        self.assertEqual(feed(spotter, np.concatenate([noise(1.0), word(seed=5), noise(1.0)])), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# tests/test_model_router.py
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.model_router import ModelRouter, ModelSpec, classify
+
+def ask(text):
+    return [{"role": "system", "content": "You are Sarah."}, {"role": "user", "content": text}]
+
+class TestModelRouter(unittest.TestCase):
+    
+    def setUp(self):
+        self.router = ModelRouter(
+            models=[ModelSpec("cheap", 0.0), ModelSpec("mid", 0.5), ModelSpec("smart", 1.0, classes=("reasoning",))],
+            budgets={"chat": 1.0, "reasoning": 3.0},
+        )
+    
+    def test_classify(self):
+        self.assertEqual(classify(ask("How are you today?")), "chat")
+        self.assertEqual(classify(ask("Explain how a rainbow forms")), "reasoning")
+        self.assertEqual(classify(ask(" ".join(["word"] * 30))), "reasoning")
+    
+    def test_prefers_cheapest_model(self):
+        self.assertEqual(self.router.choose(ask("Hello")), ("cheap", "mid"))
+    
+    def test_skips_model_over_budget(self):
+        for _ in range(10):
+            self.router.latencies.record("cheap", 2.0)
+            self.router.latencies.record("mid", 0.5)
+        self.assertEqual(self.router.choose(ask("Hello")), ("mid", "cheap"))
+        # The reasoning budget is looser, so the cheap model still qualifies
+        self.assertEqual(self.router.choose(ask("Explain tides"))[0], "cheap")
+    
+    def test_fails_over_from_failing_model(self):
+        for _ in range(3):
+            self.router.record_failure("cheap")
+        self.assertFalse(self.router.stats("cheap").healthy)
+        self.assertEqual(self.router.choose(ask("Hello"))[0], "mid")
+    
+    def test_fastest_when_nothing_meets_budget(self):
+        for _ in range(10):
+            self.router.latencies.record("cheap", 3.0)
+            self.router.latencies.record("mid", 2.0)
+        self.assertEqual(self.router.choose(ask("Hello")), ("mid", "cheap"))
+
+if __name__ == '__main__':
+    unittest.main()
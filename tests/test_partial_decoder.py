@@ -0,0 +1,78 @@
+# tests/test_partial_decoder.py
+
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.voice_input import PartialDecoder, STTBackend
+
+class ScriptedSTT(STTBackend):
+    """Returns the next scripted transcript for every call, after `delay` seconds."""
+
+    name = "scripted"
+    supports_partials = True
+
+    def __init__(self, transcripts, delay=0.0):
+        super().__init__()
+        self.transcripts = list(transcripts)
+        self.delay = delay
+        self.decoded = threading.Event()
+
+    def _transcribe(self, samples, sample_rate):
+        time.sleep(self.delay)
+        text = self.transcripts.pop(0)
+        self.decoded.set()
+        return text
+
+def early_match(partial):
+    return partial if partial in ("open firefox", "open fire") else None
+
+def decode(decoder, backend, trailing_silence):
+    backend.decoded.clear()
+    assert decoder.submit(b"\0\0" * 160, trailing_silence)
+    backend.decoded.wait(1.0)
+    time.sleep(0.05)
+
+class TestPartialDecoder(unittest.TestCase):
+
+    def test_first_partial_followed_by_a_pause_dispatches(self):
+        backend = ScriptedSTT(["open firefox"])
+        decoder = PartialDecoder(backend, early_match)
+        decode(decoder, backend, trailing_silence=0.2)
+        self.assertEqual(decoder.match, "open firefox")
+        decoder.close()
+
+    def test_word_still_being_spoken_waits(self):
+        backend = ScriptedSTT(["open fire", "open firefox", "open firefox"])
+        partials = []
+        decoder = PartialDecoder(backend, early_match, on_partial=partials.append)
+        decode(decoder, backend, trailing_silence=0.0)
+        self.assertIsNone(decoder.match)
+        decode(decoder, backend, trailing_silence=0.0)
+        self.assertIsNone(decoder.match)
+        # Same last word as the previous partial: stable without a pause
+        decode(decoder, backend, trailing_silence=0.0)
+        self.assertEqual(decoder.match, "open firefox")
+        self.assertEqual(partials, ["open fire", "open firefox", "open firefox"])
+        decoder.close()
+
+    def test_submit_does_not_wait_for_decoding(self):
+        backend = ScriptedSTT(["open", "open firefox"], delay=0.3)
+        decoder = PartialDecoder(backend, early_match)
+        start = time.time()
+        self.assertTrue(decoder.submit(b"\0\0" * 160, 0.0))
+        time.sleep(0.05)
+        # Busy: the snapshot is dropped instead of queueing up
+        self.assertFalse(decoder.submit(b"\0\0" * 160, 0.0))
+        self.assertLess(time.time() - start, 0.2)
+        backend.decoded.wait(1.0)
+        decoder.close()
+        self.assertIsNone(decoder.match)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# tests/test_resilience.py
+
+import time
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.resilience import (CircuitBreaker, CircuitOpenError, DeadlineExceeded, RetryBudget,
+                             call, current_deadline, deadline, get_breaker)
+
+class Flaky:
+    """Callable failing a given number of times before succeeding."""
+    
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+        self.timeouts = []
+    
+    def __call__(self, timeout):
+        self.calls += 1
+        self.timeouts.append(timeout)
+        if self.calls <= self.failures:
+            raise self.error("down")
+        return "ok"
+
+class TestCircuitBreaker(unittest.TestCase):
+    
+    def test_opens_after_threshold_and_fails_fast(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+    
+    def test_half_open_allows_one_trial(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        breaker.allow()
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+class TestCall(unittest.TestCase):
+    
+    def test_retries_then_succeeds(self):
+        fn = Flaky(1)
+        self.assertEqual(call("test-retry", fn, retries=1), "ok")
+        self.assertEqual(fn.calls, 2)
+    
+    def test_outage_fails_fast_once_open(self):
+        endpoint = "test-outage"
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                call(endpoint, Flaky(10), retries=0)
+        fn = Flaky(10)
+        start = time.time()
+        with self.assertRaises(CircuitOpenError):
+            call(endpoint, fn, retries=0)
+        self.assertEqual(fn.calls, 0)
+        self.assertLess(time.time() - start, 0.05)
+        self.assertEqual(get_breaker(endpoint).state, "open")
+    
+    def test_failed_result_is_returned_when_retries_run_out(self):
+        result = call("test-status", lambda timeout: 503, retries=0, is_failure=lambda r: r >= 500)
+        self.assertEqual(result, 503)
+    
+    def test_deadline_clamps_timeout(self):
+        fn = Flaky(0)
+        with deadline(0.5):
+            self.assertIsNotNone(current_deadline())
+            call("test-deadline", fn, timeout=10)
+        self.assertLessEqual(fn.timeouts[0], 0.5)
+        self.assertIsNone(current_deadline())
+    
+    def test_expired_deadline_skips_call(self):
+        fn = Flaky(0)
+        with deadline(0):
+            with self.assertRaises(DeadlineExceeded):
+                call("test-expired", fn)
+        self.assertEqual(fn.calls, 0)
+
+class TestRetryBudget(unittest.TestCase):
+    
+    def test_budget_limits_retries(self):
+        budget = RetryBudget(ratio=0.5, max_tokens=1.0)
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        budget.record_call()
+        budget.record_call()
+        self.assertTrue(budget.try_spend())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# tests/test_response_cache.py
+
+import tempfile
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.response_cache import ResponseCache, HashingEmbedder, normalize_question
+
+class TestResponseCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_normalize_question(self):
+        self.assertEqual(normalize_question("Hey Sarah, what can you do?"), "what can you do")
+        self.assertEqual(normalize_question("Tell me a joke, please Sir."), "tell me a joke")
+    
+    def test_exact_hit_after_normalization(self):
+        cache = ResponseCache(directory=self.tmp.name)
+        cache.put("Tell me a joke", "Why did the chicken...", latency=1.5)
+        self.assertEqual(cache.get("tell me a joke please"), "Why did the chicken...")
+        self.assertIsNone(cache.get("what can you do"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["saved_seconds"], 1.5)
+    
+    def test_entries_expire(self):
+        cache = ResponseCache(directory=self.tmp.name, ttl_s=-1)
+        cache.put("what can you do", "Many things.")
+        self.assertIsNone(cache.get("what can you do"))
+        self.assertEqual(cache.stats()["entries"], 0)
+    
+    def test_lru_eviction(self):
+        cache = ResponseCache(directory=self.tmp.name, max_entries=2)
+        cache.put("first question", "one")
+        cache.put("second question", "two")
+        cache.get("first question")
+        cache.put("third question", "three")
+        self.assertEqual(cache.get("first question"), "one")
+        self.assertIsNone(cache.get("second question"))
+    
+    def test_semantic_hit_and_persistence(self):
+        cache = ResponseCache(directory=self.tmp.name, embedder=HashingEmbedder(), similarity=0.8)
+        cache.put("what is the definition of photosynthesis", "It is how plants make food.")
+        self.assertEqual(cache.get("what's the definition of photosynthesis"), "It is how plants make food.")
+        self.assertIsNone(cache.get("what is the capital of france"))
+        self.assertEqual(cache.stats()["semantic_hits"], 1)
+        
+        reloaded = ResponseCache(directory=self.tmp.name, embedder=HashingEmbedder(), similarity=0.8)
+        self.assertEqual(reloaded.get("what's the definition of photosynthesis"), "It is how plants make food.")
+
+if __name__ == '__main__':
+    unittest.main()
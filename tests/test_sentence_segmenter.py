@@ -0,0 +1,43 @@
+# tests/test_sentence_segmenter.py
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.sentence_segmenter import SentenceSegmenter
+
+def stream(text, size=3):
+    """Split text into small deltas like an LLM token stream."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+class TestSentenceSegmenter(unittest.TestCase):
+    
+    def test_emits_sentences_as_they_complete(self):
+        """A sentence is returned as soon as the space after it arrives."""
+        segmenter = SentenceSegmenter()
+        self.assertEqual(segmenter.feed("The weather is nice today."), [])
+        self.assertEqual(segmenter.feed(" It"), ["The weather is nice today."])
+    
+    def test_abbreviations_and_decimals(self):
+        """Abbreviations and decimal numbers do not end a sentence."""
+        text = "Dr. Smith measured 3.14 metres, Sir. That is e.g. quite long!"
+        sentences = list(SentenceSegmenter().segment(stream(text)))
+        self.assertEqual(sentences, ["Dr. Smith measured 3.14 metres, Sir.", "That is e.g. quite long!"])
+    
+    def test_short_sentences_are_merged(self):
+        """Very short sentences are joined with the following one."""
+        sentences = list(SentenceSegmenter().segment(stream("Sure. Opening the calendar now. Done")))
+        self.assertEqual(sentences, ["Sure. Opening the calendar now.", "Done"])
+    
+    def test_flush_returns_remainder(self):
+        """Text without final punctuation is returned by flush."""
+        segmenter = SentenceSegmenter()
+        segmenter.feed("No punctuation here")
+        self.assertEqual(segmenter.flush(), ["No punctuation here"])
+        self.assertEqual(segmenter.flush(), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# tests/test_skill_registry.py
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.base_skill import Skill, SkillRegistry
+
+class TestSkillRegistry(unittest.TestCase):
+
+    def test_handler_module_imported_on_first_call(self):
+        """Declaring a skill does not import its module; dispatching does."""
+        sys.modules.pop("colorsys", None)
+        skill = Skill("colors", ["convert color"], "colorsys:rgb_to_hsv")
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertFalse(skill.loaded)
+        self.assertEqual(skill(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(skill.loaded)
+        self.assertIn("colorsys", sys.modules)
+
+    def test_registry_keeps_order_and_rejects_duplicates(self):
+        registry = SkillRegistry()
+        registry.register(Skill("b", ["bee"], "json:dumps"))
+        registry.register(Skill("a", ["ay"], "json:loads"))
+        self.assertEqual([skill.name for skill in registry], ["b", "a"])
+        self.assertIn("a", registry)
+        with self.assertRaises(ValueError):
+            registry.register(Skill("a", ["again"], "json:loads"))
+
+    def test_preload_survives_broken_skill(self):
+        registry = SkillRegistry()
+        registry.register(Skill("missing", ["x"], "no_such_module_anywhere:run"))
+        registry.register(Skill("json", ["y"], "json:dumps"))
+        registry.preload()
+        self.assertFalse(registry.get("missing").loaded)
+        self.assertTrue(registry.get("json").loaded)
+
+    def test_handler_must_name_a_function(self):
+        with self.assertRaises(ValueError):
+            Skill("bad", ["bad"], "json")
+
+if __name__ == '__main__':
+    unittest.main()
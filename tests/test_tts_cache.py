@@ -0,0 +1,82 @@
+# tests/test_tts_cache.py
+
+import tempfile
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.tts_cache import TTSCache, normalize_text
+
+def tone(seconds=0.5):
+    return np.zeros(int(24000 * seconds), dtype=np.float32)
+
+class TestTTSCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_cache(self, **kwargs):
+        return TTSCache(directory=self.tmp.name, model_version="test", **kwargs)
+
+    def test_key_normalization(self):
+        cache = self.make_cache()
+        self.assertEqual(normalize_text("  Yes,   Sir? "), "yes, sir?")
+        self.assertEqual(cache.key("Yes, Sir?", "af_heart"), cache.key(" yes,  SIR? ", "af_heart", 1.0))
+        self.assertNotEqual(cache.key("Yes, Sir?", "af_heart"), cache.key("Yes, Sir?", "af_bella"))
+        self.assertNotEqual(cache.key("Yes, Sir?", "af_heart"), cache.key("Yes, Sir?", "af_heart", 1.2))
+        other_model = TTSCache(directory=self.tmp.name, model_version="other")
+        self.assertNotEqual(cache.key("Yes, Sir?", "af_heart"), other_model.key("Yes, Sir?", "af_heart"))
+
+    def test_round_trip_and_stats(self):
+        cache = self.make_cache()
+        cache.put("Hello there", "af_heart", 1.0, tone())
+        audio = cache.get("hello   there", "af_heart")
+        self.assertEqual(len(audio), len(tone()))
+        self.assertIsNone(cache.get("Hello there", "af_bella"))
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["hits"], stats["misses"]), (1, 1, 1))
+
+    def test_lru_eviction_under_max_bytes(self):
+        cache = self.make_cache()
+        cache.put("first", "af_heart", 1.0, tone())
+        size = cache.stats()["bytes"]
+        cache.max_bytes = int(size * 2.5)
+        cache.put("second", "af_heart", 1.0, tone())
+        cache.get("first", "af_heart")
+        cache.put("third", "af_heart", 1.0, tone())
+
+        self.assertIsNone(cache.get("second", "af_heart"))
+        self.assertIsNotNone(cache.get("first", "af_heart"))
+        self.assertIsNotNone(cache.get("third", "af_heart"))
+        self.assertLessEqual(cache.stats()["bytes"], cache.max_bytes)
+        self.assertEqual(len([n for n in os.listdir(self.tmp.name) if n.endswith(".flac")]), 2)
+
+    def test_index_is_rebuilt_on_reload(self):
+        cache = self.make_cache()
+        old = cache.put("old phrase", "af_heart", 1.0, tone())
+        recent = cache.put("recent phrase", "af_heart", 1.0, tone())
+        # Recency comes from file mtimes
+        os.utime(os.path.join(self.tmp.name, f"{old}.flac"), (1000, 1000))
+        os.utime(os.path.join(self.tmp.name, f"{recent}.flac"), (2000, 2000))
+
+        reloaded = self.make_cache()
+        self.assertEqual(reloaded.stats()["entries"], 2)
+        self.assertEqual(reloaded.stats()["bytes"], cache.stats()["bytes"])
+        self.assertIn(recent, reloaded)
+
+        # The least recently used entry from before the restart goes first
+        reloaded.max_bytes = reloaded.stats()["bytes"]
+        reloaded.put("new phrase", "af_heart", 1.0, tone())
+        self.assertNotIn(old, reloaded)
+        self.assertIn(recent, reloaded)
+
+if __name__ == '__main__':
+    unittest.main()
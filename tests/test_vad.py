@@ -0,0 +1,55 @@
+# tests/test_vad.py
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.vad import EnergyZcrVAD, Endpointer
+
+FRAME = 480  # 30 ms at 16 kHz
+
+def make_frames(levels, seed=0):
+    """One noise frame per entry in levels (RMS amplitude)."""
+    rng = np.random.default_rng(seed)
+    return [rng.normal(0, level, FRAME).astype(np.int16).tobytes() for level in levels]
+
+class TestEndpointer(unittest.TestCase):
+    
+    def setUp(self):
+        self.vad = EnergyZcrVAD(lambda: 500.0)
+    
+    def test_detects_start_and_end(self):
+        """Speech starts after the onset frames and ends after trailing silence."""
+        endpointer = Endpointer(self.vad, end_silence_s=0.3)
+        events = [endpointer.process(f) for f in make_frames([50] * 10 + [3000] * 20 + [50] * 20)]
+        self.assertEqual(events.index("start"), 12)
+        self.assertEqual(events.index("end"), 39)
+    
+    def test_trims_trailing_silence(self):
+        """The utterance keeps pre-roll and a short tail, not the full pause."""
+        endpointer = Endpointer(self.vad, end_silence_s=0.6, pre_roll_s=0.0, tail_s=0.0)
+        for frame in make_frames([50] * 5 + [3000] * 10 + [50] * 30):
+            if endpointer.process(frame) == "end":
+                break
+        self.assertEqual(len(endpointer.utterance()), 10 * FRAME * 2)
+    
+    def test_silence_never_starts(self):
+        """Frames below the threshold never open an utterance."""
+        endpointer = Endpointer(self.vad)
+        events = [endpointer.process(f) for f in make_frames([100] * 50)]
+        self.assertFalse(endpointer.in_speech)
+        self.assertTrue(all(event is None for event in events))
+    
+    def test_max_utterance_length(self):
+        """Continuous speech is cut at max_utterance_s."""
+        endpointer = Endpointer(self.vad, max_utterance_s=0.9)
+        events = [endpointer.process(f) for f in make_frames([3000] * 60)]
+        self.assertIn("end", events)
+
+if __name__ == "__main__":
+    unittest.main()
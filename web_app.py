@@ -13,7 +13,7 @@ from typing import Optional, Dict, Any
 # Import Sarah AI components
 from core.voice_input import listen_with_timeout
 from core.command_router import route_command
-from core.conversation import handle_conversation
+from core.conversation import handle_conversation, start_session
 from core.tts import speak
 from core.wake_word_listener import listen_continuously, SARAH_WAKE_WORDS
 
@@ -90,6 +90,8 @@ class SarahWebInterface:
         ]
         
         conversation_count = 0
+        # Each wake-up starts a fresh conversation history, as in main.py
+        start_session()
         
         try:
             while self.is_running: